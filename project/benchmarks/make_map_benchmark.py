@@ -0,0 +1,105 @@
+"""
+Measures how many floors per second GameMap.make_map can generate at different map sizes.
+
+Run it from the repository root:
+
+    python -m project.benchmarks.make_map_benchmark
+    python -m project.benchmarks.make_map_benchmark --sizes 80x43 500x500 --scale-rooms
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import argparse
+import time
+
+import tcod as libtcod
+
+from project.entity import Entity
+from project.loader_functions.initialize_new_game import get_constants
+from project.map_objects.game_map import GameMap
+from project.render_functions import RenderOrder
+
+DEFAULT_SIZES = ['80x43', '500x500', '2000x2000']
+
+
+def parse_size(text):
+    """Turns a 'WIDTHxHEIGHT' string into a (width, height) tuple of ints."""
+
+    width, height = text.lower().split('x')
+
+    return int(width), int(height)
+
+
+def benchmark_make_map(width, height, max_rooms, room_min_size, room_max_size, repeat):
+    """Generates the same size of floor several times and times each step.
+
+    Args:
+        width(int): Width of the map.
+        height(int): Height of the map.
+        max_rooms(int): Max amount of rooms in each map.
+        room_min_size(int): How small a room can be.
+        room_max_size(int): How big a room can be.
+        repeat(int): How many floors to generate.
+
+    Returns:
+        (dict): Total seconds spent allocating tiles and running make_map,
+            and the number of entities spawned.
+    """
+
+    allocate_time = 0.0
+    make_map_time = 0.0
+    spawned = 0
+
+    for i in range(repeat):
+        player = Entity(0, 0, '@', libtcod.white, 'Player', blocks=True, render_order=RenderOrder.ACTOR)
+        entities = [player]
+
+        start = time.perf_counter()
+        game_map = GameMap(width, height)
+        allocated = time.perf_counter()
+        game_map.make_map(max_rooms, room_min_size, room_max_size, width, height, player, entities)
+        finished = time.perf_counter()
+
+        allocate_time += allocated - start
+        make_map_time += finished - allocated
+        spawned += len(entities) - 1
+
+    return {'allocate': allocate_time, 'make_map': make_map_time, 'spawned': spawned}
+
+
+def main(argv=None):
+    """Runs the benchmark for every requested size and prints a small table."""
+
+    constants = get_constants()
+
+    parser = argparse.ArgumentParser(description='Benchmark GameMap.make_map throughput.')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help='Map sizes as WIDTHxHEIGHT.')
+    parser.add_argument('--repeat', type=int, default=5, help='Floors to generate per size.')
+    parser.add_argument('--max-rooms', type=int, default=constants['max_rooms'], help='Max rooms per floor.')
+    parser.add_argument('--scale-rooms', action='store_true',
+                        help='Scale max rooms with map area, keeping the default 80x43 room density.')
+    args = parser.parse_args(argv)
+
+    base_area = constants['map_width'] * constants['map_height']
+
+    print('{0:>11} {1:>9} {2:>10} {3:>12} {4:>12} {5:>9}'.format(
+        'size', 'max_rooms', 'floors/s', 'alloc ms', 'make_map ms', 'spawned'))
+
+    for size in args.sizes:
+        width, height = parse_size(size)
+
+        max_rooms = args.max_rooms
+        if args.scale_rooms:
+            max_rooms = max(max_rooms, max_rooms * width * height // base_area)
+
+        result = benchmark_make_map(width, height, max_rooms, constants['room_min_size'],
+                                    constants['room_max_size'], args.repeat)
+
+        total = result['allocate'] + result['make_map']
+        print('{0:>11} {1:>9} {2:>10.2f} {3:>12.3f} {4:>12.3f} {5:>9}'.format(
+            size, max_rooms, args.repeat / total, 1000 * result['allocate'] / args.repeat,
+            1000 * result['make_map'] / args.repeat, result['spawned'] // args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Measures how long a frame takes to draw with render_all and with the IncrementalRenderer, and how many cells the
+IncrementalRenderer redraws per frame.
+
+A bot plays a game and every turn is drawn twice: once after the player acts, and once more with nothing changed,
+like the frames the engine draws while it waits for a key. It needs a window to draw in; on a machine without a
+display, use SDL's dummy video driver. Run it from the repository root:
+
+    python -m project.benchmarks.render_benchmark
+    SDL_VIDEODRIVER=dummy python -m project.benchmarks.render_benchmark --turns 2000 --seed 3
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import argparse
+import os
+import time
+
+import tcod as libtcod
+
+from project.bots import DescentBot
+from project.game_states import GameStates
+from project.loader_functions.initialize_new_game import get_constants
+from project.render_functions import clear_all
+from project.tools.soak_test import new_session
+
+FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dejavu10x10_gs_tc.png')
+
+
+def benchmark_render(constants, incremental, turns):
+    """Lets a bot play and draws every turn, timing the frames.
+
+    Args:
+        constants(dict): Dictionary of constant game variables. The seed decides the game.
+        incremental(bool): Draw with the IncrementalRenderer instead of render_all.
+        turns(int): Bot actions to play.
+
+    Returns:
+        (dict): Seconds spent drawing 'busy' frames (after an action) and 'idle' frames (nothing changed), the
+            number of frames of each kind, and the cells the IncrementalRenderer redrew in each kind.
+    """
+
+    constants = dict(constants, incremental_rendering=incremental)
+
+    session = new_session(constants)
+    bot = DescentBot(constants['seed'])
+
+    con = libtcod.console_new(constants['screen_width'], constants['screen_height'])
+    panel = libtcod.console_new(constants['screen_width'], constants['panel_height'])
+    mouse = libtcod.Mouse()
+
+    result = {'busy': 0.0, 'idle': 0.0, 'frames': 0, 'busy_cells': 0, 'idle_cells': 0}
+
+    for turn in range(turns):
+        for kind in ('busy', 'idle'):
+            start = time.perf_counter()
+
+            fov_recompute = session.update_fov()
+            session.render(con, panel, mouse, fov_recompute)
+
+            if not session.renderer:
+                clear_all(con, session.entities, session.camera)
+
+            result[kind] += time.perf_counter() - start
+
+            if session.renderer:
+                result[kind + '_cells'] += session.renderer.cells_redrawn
+
+        result['frames'] += 1
+
+        for event in session.step(*bot.act(session)):
+            if event.get('new_floor'):
+                con.clear()
+
+        if session.game_state == GameStates.PLAYER_DEAD:
+            break
+
+    session.close()
+
+    return result
+
+
+def main(argv=None):
+    """Runs the benchmark with both renderers and prints a small table."""
+
+    constants = get_constants()
+
+    parser = argparse.ArgumentParser(description='Benchmark render_all against the IncrementalRenderer.')
+    parser.add_argument('--turns', type=int, default=500, help='Bot actions to play and draw.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the game the bot plays.')
+    args = parser.parse_args(argv)
+
+    constants['seed'] = args.seed
+
+    libtcod.console_set_custom_font(FONT_PATH, libtcod.FONT_TYPE_GREYSCALE | libtcod.FONT_LAYOUT_TCOD)
+    libtcod.console_init_root(constants['screen_width'], constants['screen_height'], constants['window_title'], False)
+
+    screen_cells = constants['screen_width'] * (constants['screen_height'] + constants['panel_height'])
+
+    print('{0:>12} {1:>8} {2:>10} {3:>10} {4:>12} {5:>12}'.format(
+        'renderer', 'frames', 'busy us', 'idle us', 'busy cells', 'idle cells'))
+
+    for incremental in (False, True):
+        result = benchmark_render(constants, incremental, args.turns)
+        frames = result['frames']
+
+        if incremental:
+            busy_cells = result['busy_cells'] / frames
+            idle_cells = result['idle_cells'] / frames
+        else:
+            busy_cells = idle_cells = screen_cells
+
+        print('{0:>12} {1:>8} {2:>10.1f} {3:>10.1f} {4:>12.1f} {5:>12.1f}'.format(
+            'incremental' if incremental else 'render_all', frames, 1e6 * result['busy'] / frames,
+            1e6 * result['idle'] / frames, busy_cells, idle_cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+Bots that play a GameSession without a human, for soak tests and balance runs.
+
+A bot looks at the session and returns the next action, in the same form as handle_keys and handle_mouse:
+
+    action, mouse_action = bot.act(session)
+    events = session.step(action, mouse_action)
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import random
+
+from project.game_states import GameStates
+
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, -1), (-1, 1), (1, 1))
+
+
+class RandomBot:
+    """Mashes random keys: mostly moves, sometimes waiting, picking up, using items or taking the stairs.
+
+    Attributes:
+        rng(Random): Where the bot's choices come from.
+    """
+
+    def __init__(self, seed=None):
+        """Inits the bot.
+
+        Args:
+            seed(int): Seed for the bot's choices.
+        """
+
+        self.rng = random.Random(seed)
+
+    def act(self, session):
+        """Picks the next action.
+
+        Args:
+            session(GameSession): The game being played.
+
+        Returns:
+            action(dict): What the player does, in the form handle_keys returns.
+            mouse_action(dict): Mouse clicks, in the form handle_mouse returns.
+        """
+
+        rng = self.rng
+        game_state = session.game_state
+
+        if game_state == GameStates.LEVEL_UP:
+            return {'level_up': rng.choice(('hp', 'str', 'def'))}, {}
+
+        if game_state == GameStates.TARGETING:
+            return {}, {'left_click': (rng.randrange(session.game_map.width), rng.randrange(session.game_map.height))}
+
+        if game_state in (GameStates.SHOW_INVENTORY, GameStates.DROP_INVENTORY):
+            if session.player.inventory.items and rng.random() < 0.5:
+                return {'inventory_index': rng.randrange(len(session.player.inventory.items))}, {}
+
+            return {'exit': True}, {}
+
+        if game_state == GameStates.CHARACTER_SCREEN:
+            return {'exit': True}, {}
+
+        roll = rng.random()
+
+        if roll < 0.8:
+            return {'move': rng.choice(DIRECTIONS)}, {}
+        elif roll < 0.88:
+            return {'wait': True}, {}
+        elif roll < 0.94:
+            return {'pickup': True}, {}
+        elif roll < 0.98:
+            return {'show_inventory': True}, {}
+
+        return {'take_stairs': True}, {}
+
+
+class DescentBot:
+    """Plays to get as deep as possible.
+
+    Fights whatever is next to it, drinks a healing potion when it's
+    hurt, casts scrolls at the nearest monster it can see, picks up what
+    it walks over, equips gear for empty slots and heads for the stairs.
+
+    Attributes:
+        heal_below(float): Drink a potion when HP falls below this fraction of max HP.
+        rng(Random): Where the bot's choices come from when it's stuck.
+        pending_item(int): Inventory index to choose once the inventory opens, or None.
+    """
+
+    def __init__(self, seed=None, heal_below=0.4):
+        """Inits the bot.
+
+        Args:
+            seed(int): Seed for the bot's choices when it's stuck.
+            heal_below(float): Drink a potion when HP falls below this fraction of max HP.
+        """
+
+        self.heal_below = heal_below
+        self.rng = random.Random(seed)
+        self.pending_item = None
+
+    def act(self, session):
+        """Picks the next action.
+
+        Args:
+            session(GameSession): The game being played.
+
+        Returns:
+            action(dict): What the player does, in the form handle_keys returns.
+            mouse_action(dict): Mouse clicks, in the form handle_mouse returns.
+        """
+
+        player = session.player
+        game_map = session.game_map
+        game_state = session.game_state
+
+        if game_state == GameStates.LEVEL_UP:
+            return {'level_up': 'hp' if player.fighter.max_hp < 150 else 'str'}, {}
+
+        if game_state == GameStates.TARGETING:
+            target = self.nearest_visible_monster(session)
+
+            if target:
+                return {}, {'left_click': (target.x, target.y)}
+
+            return {}, {'right_click': (player.x, player.y)}
+
+        if game_state == GameStates.SHOW_INVENTORY and self.pending_item is not None:
+            index, self.pending_item = self.pending_item, None
+            return {'inventory_index': index}, {}
+
+        if game_state in (GameStates.SHOW_INVENTORY, GameStates.DROP_INVENTORY, GameStates.CHARACTER_SCREEN):
+            return {'exit': True}, {}
+
+        for entity in game_map.actors.awake:
+            if entity.fighter and player.distance_to(entity) < 2:
+                if player.fighter.hp < player.fighter.max_hp * self.heal_below and self.choose_item(player, 'heal'):
+                    return {'show_inventory': True}, {}
+
+                return {'move': (entity.x - player.x, entity.y - player.y)}, {}
+
+        if player.fighter.hp < player.fighter.max_hp * self.heal_below and self.choose_item(player, 'heal'):
+            return {'show_inventory': True}, {}
+
+        if self.nearest_visible_monster(session) and self.choose_item(player, 'cast_'):
+            return {'show_inventory': True}, {}
+
+        if self.choose_gear(player):
+            return {'show_inventory': True}, {}
+
+        cell = game_map.entity_index.entities_at(player.x, player.y)
+
+        if len(player.inventory.items) < player.inventory.capacity and any(entity.item for entity in cell):
+            return {'pickup': True}, {}
+
+        if any(entity.stairs for entity in cell):
+            return {'take_stairs': True}, {}
+
+        stairs = next((entity for entity in session.entities if entity.stairs), None)
+
+        if stairs:
+            path = game_map.navigation.get_route(player.x, player.y, stairs.x, stairs.y)
+
+            if path:
+                x, y = path[0]
+                dx, dy = x - player.x, y - player.y
+
+                # Moves are one step; anything else would teleport the player.
+                if max(abs(dx), abs(dy)) == 1:
+                    return {'move': (dx, dy)}, {}
+
+        return {'move': self.rng.choice(DIRECTIONS)}, {}
+
+    def choose_item(self, player, function_prefix):
+        """Finds an item whose use function's name starts with a prefix, and remembers to pick it in the inventory.
+
+        Args:
+            player(Entity): The player's Entity object.
+            function_prefix(str): E.g. 'heal' or 'cast_'.
+
+        Returns:
+            (bool): Was there such an item?
+        """
+
+        for index, item in enumerate(player.inventory.items):
+            use_function = item.item.use_function if item.item else None
+
+            if use_function and use_function.__name__.startswith(function_prefix):
+                self.pending_item = index
+                return True
+
+        return False
+
+    def choose_gear(self, player):
+        """Finds carried gear for a slot that's still empty, and remembers to pick it in the inventory.
+
+        Args:
+            player(Entity): The player's Entity object.
+
+        Returns:
+            (bool): Was there such gear?
+        """
+
+        equipment = player.equipment
+
+        for index, item in enumerate(player.inventory.items):
+            if item.equippable and item not in (equipment.main_hand, equipment.off_hand):
+                slot = item.equippable.slot
+
+                if getattr(equipment, slot.name.lower()) is None:
+                    self.pending_item = index
+                    return True
+
+        return False
+
+    @staticmethod
+    def nearest_visible_monster(session):
+        """Returns the closest monster in the player's FOV, or None.
+
+        Args:
+            session(GameSession): The game being played.
+        """
+
+        player = session.player
+        visible = session.fov_map.fov
+        monsters = [entity for entity in session.game_map.actors.awake
+                    if entity.fighter and visible[entity.y, entity.x]]
+
+        return min(monsters, key=player.distance_to, default=None)
@@ -0,0 +1,115 @@
+"""
+The window onto the map that's drawn on the screen, so maps can be bigger than the screen.
+
+Map coordinates and screen coordinates only match while the camera is at (0, 0). Everything that draws the map
+translates with to_screen, and everything that reads the mouse translates back with to_map.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+
+class Camera:
+    """The part of the map shown on the screen, following the player.
+
+    The camera keeps the player in the middle of the view, except near the
+    edges of the map, where it stops so nothing beyond the map is shown. A
+    map smaller than the view is drawn from the top left corner.
+
+    Attributes:
+        x(int): Map x coordinate of the top left cell on the screen.
+        y(int): Map y coordinate of the top left cell on the screen.
+        width(int): Width of the view in cells.
+        height(int): Height of the view in cells.
+        map_width(int): Width of the map being looked at.
+        map_height(int): Height of the map being looked at.
+    """
+
+    def __init__(self, width, height):
+        """Inits a camera at the top left corner of the map.
+
+        Args:
+            width(int): Width of the view in cells.
+            height(int): Height of the view in cells.
+        """
+
+        self.x = 0
+        self.y = 0
+        self.width = width
+        self.height = height
+        self.map_width = width
+        self.map_height = height
+
+    def follow(self, target_x, target_y, map_width, map_height):
+        """Moves the camera so a map cell is in the middle of the view, as far as the edges of the map allow.
+
+        Args:
+            target_x(int): x coordinate to look at, usually the player's.
+            target_y(int): y coordinate to look at.
+            map_width(int): Width of the map.
+            map_height(int): Height of the map.
+
+        Returns:
+            (bool): Did the camera move, or start looking at a map of another size?
+        """
+
+        x = min(max(target_x - self.width // 2, 0), max(map_width - self.width, 0))
+        y = min(max(target_y - self.height // 2, 0), max(map_height - self.height, 0))
+
+        moved = (x, y, map_width, map_height) != (self.x, self.y, self.map_width, self.map_height)
+
+        self.x = x
+        self.y = y
+        self.map_width = map_width
+        self.map_height = map_height
+
+        return moved
+
+    @property
+    def map_area(self):
+        """Returns the (x1, y1, x2, y2) rectangle of map cells on the screen, ends exclusive."""
+
+        return (self.x, self.y, min(self.x + self.width, self.map_width), min(self.y + self.height, self.map_height))
+
+    def in_view(self, x, y):
+        """Says if a map cell is on the screen.
+
+        Args:
+            x(int): Map x coordinate.
+            y(int): Map y coordinate.
+        """
+
+        x1, y1, x2, y2 = self.map_area
+
+        return x1 <= x < x2 and y1 <= y < y2
+
+    def to_screen(self, x, y):
+        """Turns map coordinates into screen coordinates.
+
+        Args:
+            x(int): Map x coordinate.
+            y(int): Map y coordinate.
+
+        Returns:
+            (tuple): (x, y) on the screen.
+        """
+
+        return x - self.x, y - self.y
+
+    def to_map(self, screen_x, screen_y):
+        """Turns screen coordinates, e.g. the mouse's, into map coordinates.
+
+        Args:
+            screen_x(int): x coordinate on the screen.
+            screen_y(int): y coordinate on the screen.
+
+        Returns:
+            (tuple): (x, y) on the map, or None if the screen cell doesn't show the map.
+        """
+
+        x = screen_x + self.x
+        y = screen_y + self.y
+
+        if 0 <= screen_x < self.width and 0 <= screen_y < self.height and self.in_view(x, y):
+            return x, y
+
+        return None
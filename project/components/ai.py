@@ -1,99 +1,174 @@
-"""
-This is where all of our different monster AIs go.
-"""
-
-#  Coded by Philip Hofman, Copyright (c) 2020.
-
-import tcod as libtcod
-
-from random import randint
-
-from project.game_messages import Message
-
-
-class BasicMonster:
-    """Contains code for Basic monster AI behaviour."""
-
-    def take_turn(self, target, fov_map, game_map, entities):
-        """Decides what the monster will do on its turn.
-
-        The monster first determines if it can see the target it was given.
-        Then, if it can, it moves towards the target. If the monster is
-        already adjacent and the target still has health left, it attacks.
-        We extend the attack results and damage results to ensure
-        one list of results is returned, rather than a list comprised
-        of many small lists, which would make iterating through it harder.
-
-        Args:
-            target(Entity): The target the monster will move towards.
-            fov_map(Map): The map used to calculate FOV.
-            game_map(Map): The map used to actually display the game.
-            entities(list): The list containing Entity objects.
-
-        Returns:
-            results(list): A list containing the attack results.
-                 (See Fighter component attack function)
-        """
-
-        results = []
-
-        monster = self.owner
-
-        if fov_map.fov[monster.y, monster.x]:
-
-            if monster.distance_to(target) >= 2:
-                monster.move_astar(target, entities, game_map)
-
-            elif target.fighter.hp > 0:
-                attack_results = monster.fighter.attack(target)
-                results.extend(attack_results)
-
-        return results
-
-
-class ConfusedMonster:
-    """Contains everything for Confused monster AI behaviour."""
-
-    def __init__(self, previous_ai, number_of_turns=10):
-        """Inits starting values for the Confused AI.
-
-        Args:
-            previous_ai(AI Component): What AI the monster was using last.
-            number_of_turns(int): How long Confusion lasts.
-        """
-        self.previous_ai = previous_ai
-        self.number_of_turns = number_of_turns
-
-    def take_turn(self, target, fov_map, game_map, entities):
-        """Runs one turn of Confused AI.
-
-            Makes the monster Confused for a set number of
-            turns. It wanders around in a random direction or
-            stays put each turn.
-
-        Args:
-            target(Entity): Not Used for this AI.
-            fov_map(Map): Not Used for this AI.
-            game_map(Map): TCOD map used as the game map.
-            entities(list): List of entities present on the map.
-
-        Returns:
-             results(list): A list containing the results of the turn.
-        """
-
-        results = []
-
-        if self.number_of_turns > 0:
-            random_x = self.owner.x + randint(0, 2) - 1
-            random_y = self.owner.y + randint(0, 2) - 1
-
-            if random_x != self.owner.x and random_y != self.owner.y:
-                self.owner.move_towards(random_x, random_y, game_map, entities)
-
-            self.number_of_turns -= 1
-
-        else:
-            self.owner.ai = self.previous_ai
-            results.append({'message': Message('The {0} is no longer confused!'.format(self.owner.name), libtcod.red)})
-
-        return results
+"""
+This is where all of our different monster AIs go.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import tcod as libtcod
+
+from project.game_messages import Message
+from project.map_objects.navigation import PathCache
+
+
+class BasicMonster:
+    """Contains code for Basic monster AI behaviour.
+
+    Attributes:
+        noise(tuple): The (x, y) of the last noise heard that hasn't been checked out yet, or None.
+        path_cache(PathCache): The monster's last route towards its target.
+    """
+
+    def __init__(self):
+        """Inits the AI with nothing heard and no route planned."""
+
+        self.noise = None
+        self.path_cache = PathCache()
+
+    def is_dormant(self, fov_map):
+        """Returns True if the monster has nothing to do: it can't see the target and isn't following a noise.
+
+        Args:
+            fov_map(Map): The map used to calculate FOV.
+        """
+
+        monster = self.owner
+
+        return not fov_map.fov[monster.y, monster.x] and self.noise is None
+
+    def hear_noise(self, x, y):
+        """Makes the monster go and check out a noise.
+
+        Args:
+            x(int): x coordinate of the noise.
+            y(int): y coordinate of the noise.
+        """
+
+        self.noise = (x, y)
+
+    def take_turn(self, target, fov_map, game_map, entities):
+        """Decides what the monster will do on its turn.
+
+        The monster first determines if it can see the target it was given.
+        Then, if it can, it moves towards the target, down the map's flow
+        field if there's one leading to the target, otherwise by A*. If the monster is
+        already adjacent and the target still has health left, it attacks.
+        If it can't see the target but heard a noise, it heads towards the
+        noise, and forgets about it once it's there or can't get closer.
+        We extend the attack results and damage results to ensure
+        one list of results is returned, rather than a list comprised
+        of many small lists, which would make iterating through it harder.
+
+        Args:
+            target(Entity): The target the monster will move towards.
+            fov_map(Map): The map used to calculate FOV.
+            game_map(Map): The map used to actually display the game.
+            entities(list): The list containing Entity objects.
+
+        Returns:
+            results(list): A list containing the attack results.
+                 (See Fighter component attack function)
+        """
+
+        results = []
+
+        monster = self.owner
+
+        if fov_map.fov[monster.y, monster.x]:
+
+            if monster.distance_to(target) >= 2:
+                # Everyone chasing the same target shares one flow field when it's enabled
+                if game_map.navigation.flow_target == (target.x, target.y):
+                    monster.move_along_flow(target, entities, game_map)
+                else:
+                    monster.move_astar(target, entities, game_map, path_cache=self.path_cache)
+
+            elif target.fighter.hp > 0:
+                attack_results = monster.fighter.attack(target)
+                results.extend(attack_results)
+
+            self.noise = None
+
+        elif self.noise:
+            old_x = monster.x
+            old_y = monster.y
+            noise_x, noise_y = self.noise
+
+            monster.move_towards(noise_x, noise_y, game_map, entities)
+
+            if (monster.x, monster.y) == (old_x, old_y) or (monster.x, monster.y) == self.noise:
+                self.noise = None
+            elif monster.blocks:
+                game_map.navigation.entity_moved(old_x, old_y, monster.x, monster.y)
+
+        return results
+
+
+class ConfusedMonster:
+    """Contains everything for Confused monster AI behaviour."""
+
+    def __init__(self, previous_ai, number_of_turns=10):
+        """Inits starting values for the Confused AI.
+
+        Args:
+            previous_ai(AI Component): What AI the monster was using last.
+            number_of_turns(int): How long Confusion lasts.
+        """
+        self.previous_ai = previous_ai
+        self.number_of_turns = number_of_turns
+
+    def is_dormant(self, fov_map):
+        """A Confused monster stumbles around wherever it is, so it never goes dormant."""
+
+        return False
+
+    def hear_noise(self, x, y):
+        """Passes the noise on to the AI the monster goes back to once it's no longer confused.
+
+        Args:
+            x(int): x coordinate of the noise.
+            y(int): y coordinate of the noise.
+        """
+
+        self.previous_ai.hear_noise(x, y)
+
+    def take_turn(self, target, fov_map, game_map, entities):
+        """Runs one turn of Confused AI.
+
+            Makes the monster Confused for a set number of
+            turns. It wanders around in a random direction or
+            stays put each turn.
+
+        Args:
+            target(Entity): Not Used for this AI.
+            fov_map(Map): Not Used for this AI.
+            game_map(Map): TCOD map used as the game map. Its 'ai' random stream
+                picks the direction.
+            entities(list): List of entities present on the map.
+
+        Returns:
+             results(list): A list containing the results of the turn.
+        """
+
+        results = []
+
+        if self.number_of_turns > 0:
+            rng = game_map.rng.stream('ai')
+            random_x = self.owner.x + rng.randint(0, 2) - 1
+            random_y = self.owner.y + rng.randint(0, 2) - 1
+
+            if random_x != self.owner.x and random_y != self.owner.y:
+                old_x = self.owner.x
+                old_y = self.owner.y
+
+                self.owner.move_towards(random_x, random_y, game_map, entities)
+
+                if self.owner.blocks and (self.owner.x, self.owner.y) != (old_x, old_y):
+                    game_map.navigation.entity_moved(old_x, old_y, self.owner.x, self.owner.y)
+
+            self.number_of_turns -= 1
+
+        else:
+            self.owner.ai = self.previous_ai
+            results.append({'message': Message('The {0} is no longer confused!'.format(self.owner.name), libtcod.red)})
+
+        return results
@@ -0,0 +1,158 @@
+"""
+Off-screen consoles that are kept around and reused, instead of being made with console_new on every frame.
+
+A ConsolePool hands out blank consoles of a given size and takes them back when they're no longer needed. A
+ConsoleCache remembers consoles that were already drawn, keyed by whatever was drawn on them, so something that
+didn't change can be blitted again as it is:
+
+    window = console_cache.get(key)
+
+    if window is None:
+        window = console_pool.acquire(width, height)
+        ...print on the window...
+        console_cache.store(key, window)
+
+    libtcod.console_blit(window, ...)
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+from collections import OrderedDict
+
+import tcod as libtcod
+
+
+class ConsolePool:
+    """Blank off-screen consoles, kept by size for reuse.
+
+    Attributes:
+        max_free(int): Most consoles of one size kept for reuse. More than that are left to be freed.
+        free(dict): (width, height) -> list of consoles that can be handed out.
+        created(int): Consoles made with console_new so far.
+        reused(int): Consoles handed out again from the pool.
+    """
+
+    def __init__(self, max_free=4):
+        """Inits an empty pool.
+
+        Args:
+            max_free(int): Most consoles of one size kept for reuse.
+        """
+
+        self.max_free = max_free
+        self.free = {}
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, width, height):
+        """Hands out a blank console, from the pool if there's one of this size.
+
+        Args:
+            width(int): Width of the console.
+            height(int): Height of the console.
+
+        Returns:
+            (Console): A cleared console, with white on black as its default colors.
+        """
+
+        consoles = self.free.get((width, height))
+
+        if not consoles:
+            self.created += 1
+            return libtcod.console_new(width, height)
+
+        self.reused += 1
+
+        console = consoles.pop()
+        libtcod.console_set_default_foreground(console, libtcod.white)
+        libtcod.console_set_default_background(console, libtcod.black)
+        libtcod.console_clear(console)
+
+        return console
+
+    def release(self, console):
+        """Takes back a console that isn't used anymore.
+
+        Args:
+            console(Console): A console handed out by acquire.
+        """
+
+        consoles = self.free.setdefault((console.width, console.height), [])
+
+        if len(consoles) < self.max_free:
+            consoles.append(console)
+
+
+class ConsoleCache:
+    """A least-recently-used cache of drawn consoles, keyed by what was drawn on them.
+
+    Consoles that drop out of the cache go back to the pool.
+
+    Attributes:
+        pool(ConsolePool): Where evicted consoles go.
+        max_entries(int): Most drawn consoles kept.
+        entries(OrderedDict): key -> console, least recently used first.
+        hits(int): How many times a drawn console was reused.
+        misses(int): How many times a console had to be drawn.
+    """
+
+    def __init__(self, pool, max_entries=16):
+        """Inits an empty cache.
+
+        Args:
+            pool(ConsolePool): Where evicted consoles go.
+            max_entries(int): Most drawn consoles kept.
+        """
+
+        self.pool = pool
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the console drawn for a key, or None if it has to be drawn.
+
+        Args:
+            key(tuple): Everything that was drawn on the console.
+
+        Returns:
+            (Console): The drawn console, or None.
+        """
+
+        console = self.entries.get(key)
+
+        if console is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+
+        return console
+
+    def store(self, key, console):
+        """Keeps a freshly drawn console, evicting old ones to stay under max_entries.
+
+        Args:
+            key(tuple): Everything that was drawn on the console.
+            console(Console): The drawn console, usually from the pool. It belongs to the cache from now on.
+        """
+
+        old_console = self.entries.pop(key, None)
+        if old_console is not None and old_console is not console:
+            self.pool.release(old_console)
+
+        self.entries[key] = console
+
+        while len(self.entries) > self.max_entries:
+            old_key, old_console = self.entries.popitem(last=False)
+            self.pool.release(old_console)
+
+    def clear(self):
+        """Sends every drawn console back to the pool. The counters are kept."""
+
+        for console in self.entries.values():
+            self.pool.release(console)
+
+        self.entries.clear()
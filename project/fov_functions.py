@@ -1,45 +1,190 @@
-#  Coded by Philip Hofman, Copyright (c) 2020.
-
-import tcod as libtcod
-
-
-def initialize_fov(game_map):  # Define function initialize_fov and pass it an arbitrary game_map
-    """Creates a new map that stores sight-line info for FOV calculations.
-
-    Creates a separate map identical to the actual game map. Iterates
-    through each tile and sets whether it is transparent and/or blocks
-    movement. It decides this based on the flags in the game_map,
-    'block_sight' and 'blocked'.
-
-    Args:
-        game_map(Map): A tcod Map that is being used as the visible game map.
-
-    Returns:
-        fov_map(Map): A new Map that contains FOV information about
-        each tile, specifically whether it's transparent (i.e. a floor)
-        and whether it blocks other stuff (i.e. a wall).
-    """
-
-    fov_map = libtcod.map.Map(game_map.width, game_map.height)
-
-    for y in range(game_map.height):
-        for x in range(game_map.width):
-            fov_map.transparent[y, x] = not game_map.tiles[x][y].block_sight
-            fov_map.walkable[y, x] = not game_map.tiles[x][y].blocked
-
-    return fov_map
-
-
-def recompute_fov(fov_map, x, y, radius, light_walls=True, algorithm=0):
-    """Recalculates the FOV using the TCOD 'compute_fov' method.
-
-    Args:
-        fov_map(Map): A tcod Map being used for FOV calculations.
-        x(int): x coordinate.
-        y(int): y coordinate.
-        radius(int): How far the player can see in tiles.
-        light_walls(bool): Decides if visible obstacles will be returned.
-        algorithm(int): Chooses which FOV algorithm to run.
-    """
-
-    fov_map.compute_fov(x, y, radius, light_walls, algorithm)
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+from collections import OrderedDict
+
+import numpy as np
+import tcod as libtcod
+
+
+def initialize_fov(game_map):  # Define function initialize_fov and pass it an arbitrary game_map
+    """Creates a new map that stores sight-line info for FOV calculations.
+
+    Creates a separate map identical to the actual game map, and sets
+    whether each tile is transparent and/or blocks movement. It decides
+    this based on the flags in the game_map, 'block_sight' and 'blocked',
+    with one whole-array assignment per flag. The tile arrays are indexed
+    [x, y] while the tcod Map is indexed [y, x], hence the transposes.
+    Use update_fov_cells to patch the map when only a few tiles change.
+
+    Args:
+        game_map(Map): A tcod Map that is being used as the visible game map.
+
+    Returns:
+        fov_map(Map): A new Map that contains FOV information about
+        each tile, specifically whether it's transparent (i.e. a floor)
+        and whether it blocks other stuff (i.e. a wall).
+    """
+
+    fov_map = libtcod.map.Map(game_map.width, game_map.height)
+
+    fov_map.transparent[...] = ~game_map.tiles['block_sight'].T
+    fov_map.walkable[...] = ~game_map.tiles['blocked'].T
+
+    return fov_map
+
+
+def update_fov_cells(fov_map, game_map, changed_cells):
+    """Patches an existing FOV map after some tiles changed.
+
+    Rather than rebuilding the whole map with initialize_fov (e.g. after
+    digging a wall or toggling a door), only the changed cells are copied
+    over from the game map, in one vectorized assignment per flag.
+
+    Args:
+        fov_map(Map): The tcod Map made by initialize_fov for this game_map.
+        game_map(Map): The game map whose tiles changed.
+        changed_cells(iterable): (x, y) coordinates of the tiles that changed.
+    """
+
+    cells = np.asarray(list(changed_cells), dtype=np.intp).reshape(-1, 2)
+    xs = cells[:, 0]
+    ys = cells[:, 1]
+
+    fov_map.transparent[ys, xs] = ~game_map.tiles['block_sight'][xs, ys]
+    fov_map.walkable[ys, xs] = ~game_map.tiles['blocked'][xs, ys]
+
+
+def recompute_fov(fov_map, x, y, radius, light_walls=True, algorithm=0, cache=None, map_version=0):
+    """Recalculates the FOV using the TCOD 'compute_fov' method.
+
+    If a FovCache is passed, a previously computed FOV for the same
+    position, settings and map version is copied back instead of
+    running the algorithm again.
+
+    Args:
+        fov_map(Map): A tcod Map being used for FOV calculations.
+        x(int): x coordinate.
+        y(int): y coordinate.
+        radius(int): How far the player can see in tiles.
+        light_walls(bool): Decides if visible obstacles will be returned.
+        algorithm(int): Chooses which FOV algorithm to run.
+        cache(FovCache): Optional cache of computed FOVs.
+        map_version(int): The game map's version. Must change whenever the
+            map's transparency does.
+    """
+
+    if cache is None:
+        fov_map.compute_fov(x, y, radius, light_walls, algorithm)
+        return
+
+    key = (x, y, radius, algorithm, light_walls, map_version)
+
+    if not cache.restore(key, fov_map):
+        fov_map.compute_fov(x, y, radius, light_walls, algorithm)
+        cache.store(key, fov_map)
+
+
+class FovCache:
+    """A least-recently-used cache of computed FOVs.
+
+    Entries are keyed by (x, y, radius, algorithm, light_walls, map_version).
+    With a radius, only the square around the viewer that the FOV can reach
+    is stored. Whenever a key with a new map version comes in, everything
+    computed for the old version is thrown away.
+
+    Attributes:
+        max_bytes(int): Max total size of the stored FOV masks.
+        entries(OrderedDict): key -> (window, mask), least recently used first.
+        bytes(int): Total size of the stored masks.
+        map_version(int): The map version the stored entries belong to.
+        hits(int): How many times a stored FOV was reused.
+        misses(int): How many times the FOV had to be computed.
+    """
+
+    def __init__(self, max_bytes=1024 * 1024):
+        """Inits an empty cache.
+
+        Args:
+            max_bytes(int): Max total size of the stored FOV masks.
+        """
+
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.map_version = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        """Returns the fraction of lookups that were hits."""
+
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        """Throws away every stored FOV. The counters are kept."""
+
+        self.entries.clear()
+        self.bytes = 0
+
+    @staticmethod
+    def _window(key, fov_map):
+        """Returns the slices of the FOV (indexed [y, x]) that a key's FOV can reach."""
+
+        x, y, radius = key[:3]
+
+        if radius <= 0:
+            return slice(None), slice(None)
+
+        return (slice(max(y - radius, 0), min(y + radius + 1, fov_map.height)),
+                slice(max(x - radius, 0), min(x + radius + 1, fov_map.width)))
+
+    def restore(self, key, fov_map):
+        """Copies a stored FOV into fov_map, if there is one.
+
+        Args:
+            key(tuple): (x, y, radius, algorithm, light_walls, map_version).
+            fov_map(Map): The tcod Map to copy the FOV into.
+
+        Returns:
+            (bool): True on a hit, False on a miss.
+        """
+
+        if key[-1] != self.map_version:
+            self.clear()
+            self.map_version = key[-1]
+
+        entry = self.entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return False
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+
+        window, mask = entry
+        fov_map.fov[...] = False
+        fov_map.fov[window] = mask
+
+        return True
+
+    def store(self, key, fov_map):
+        """Stores the FOV currently in fov_map, evicting old entries to stay under max_bytes.
+
+        Args:
+            key(tuple): (x, y, radius, algorithm, light_walls, map_version).
+            fov_map(Map): The tcod Map holding the freshly computed FOV.
+        """
+
+        window = self._window(key, fov_map)
+        mask = fov_map.fov[window].copy()
+
+        self.entries[key] = (window, mask)
+        self.bytes += mask.nbytes
+
+        while self.bytes > self.max_bytes and self.entries:
+            old_key, (old_window, old_mask) = self.entries.popitem(last=False)
+            self.bytes -= old_mask.nbytes
@@ -0,0 +1,116 @@
+"""
+Paces the main loops, so they sleep while nothing happens instead of spinning on sys_check_for_event.
+
+The loop asks the clock whether to draw, then lets it wait for the next event:
+
+    clock = FrameClock(constants['frame_cap'], constants['animation_tick_ms'])
+
+    while not libtcod.console_is_window_closed():
+        if clock.should_draw():
+            ...draw and flush...
+
+        clock.wait()
+        libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS | libtcod.EVENT_MOUSE, key, mouse)
+        ...handle the input...
+
+Input is handled as soon as it arrives; the frame cap only holds back drawing when events come in faster than that.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import math
+import time
+
+import tcod
+
+
+class FrameClock:
+    """Decides when the main loop draws and how long it can sleep.
+
+    A frame is drawn after every event, or on an animation tick, but
+    never sooner than the frame cap allows after the previous frame.
+
+    Attributes:
+        frame_time(float): Least seconds between two frames, or 0 for no cap.
+        tick_time(float): Seconds between animation ticks, or 0 for none.
+        last_frame(float): time.perf_counter() of the last frame drawn.
+        redraw(bool): Is there a frame waiting to be drawn?
+        frames(int): Frames drawn so far.
+    """
+
+    def __init__(self, frame_cap=60, animation_tick_ms=0):
+        """Inits the clock, with the first frame due right away.
+
+        Args:
+            frame_cap(int): Most frames per second, or 0 for no cap.
+            animation_tick_ms(int): Draw a frame at least this often, for anything animated, or 0 to only draw
+                after events.
+        """
+
+        self.frame_time = 1 / frame_cap if frame_cap else 0.0
+        self.tick_time = animation_tick_ms / 1000
+        self.last_frame = -math.inf
+        self.redraw = True
+        self.frames = 0
+
+    def request_redraw(self):
+        """Asks for a frame as soon as the frame cap allows."""
+
+        self.redraw = True
+
+    def next_frame_due(self):
+        """Returns the time.perf_counter() the next frame is due at, or None if none is waiting."""
+
+        due = []
+
+        if self.redraw:
+            due.append(self.last_frame + self.frame_time)
+
+        if self.tick_time:
+            due.append(self.last_frame + self.tick_time)
+
+        return min(due) if due else None
+
+    def should_draw(self):
+        """Says if a frame is due now. If so, it's counted as drawn.
+
+        Returns:
+            (bool): Draw a frame now?
+        """
+
+        due = self.next_frame_due()
+        now = time.perf_counter()
+
+        if due is None or now < due:
+            return False
+
+        self.last_frame = now
+        self.redraw = False
+        self.frames += 1
+
+        return True
+
+    def wait(self):
+        """Sleeps until an event comes in or the next frame is due. Events are left for sys_check_for_event.
+
+        Any event asks for a redraw, since it might change what's on the
+        screen (a key, the mouse moving, the window being uncovered).
+
+        Returns:
+            (bool): Is there an event waiting?
+        """
+
+        due = self.next_frame_due()
+
+        if due is None:
+            timeout_ms = -1
+        else:
+            timeout_ms = max(0, math.ceil((due - time.perf_counter()) * 1000))
+
+        # A negative timeout waits for as long as it takes.
+        event_waiting = bool(tcod.lib.SDL_WaitEventTimeout(tcod.ffi.NULL, timeout_ms))
+
+        if event_waiting:
+            self.request_redraw()
+
+        return event_waiting
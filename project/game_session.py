@@ -0,0 +1,465 @@
+"""
+The game's turn logic, without a window.
+
+A GameSession holds everything about a game in progress and plays one action at a time through step(). The engine's
+main loop feeds it key presses and draws it, but nothing here needs a window, so scripts and bots can drive it too,
+as fast as the turns can be computed.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import time
+
+import tcod as libtcod
+
+from project.camera import Camera
+from project.death_functions import kill_monster, kill_player
+from project.fov_functions import FovCache, initialize_fov, recompute_fov
+from project.game_messages import Message
+from project.game_states import GameStates
+from project.incremental_renderer import IncrementalRenderer
+from project.map_objects.floor_pregenerator import FloorPregenerator
+from project.map_objects.floor_store import FloorStore
+from project.render_functions import render_all
+from project.turn_scheduler import TurnScheduler
+
+
+class GameSession:
+    """A game in progress, played one action at a time.
+
+    Actions are the dictionaries handle_keys and handle_mouse return,
+    e.g. {'move': (1, 0)}, {'pickup': True} or {'left_click': (x, y)}.
+
+    Attributes:
+        player(Entity): Player Entity object.
+        entities(list): List of entities on the current floor.
+        game_map(GameMap): The current floor.
+        message_log(MessageLog): The in-game messages.
+        game_state(Enum): The current GameState.
+        previous_game_state(Enum): The GameState to go back to after a menu.
+        constants(dict): Dictionary of constant game variables.
+        fov_map(Map): The player's field of view.
+        fov_recompute(bool): Does the FOV need computing before it's used next?
+        fov_cache(FovCache): Recently computed FOVs.
+        targeting_item(Entity): The item waiting for a target, if any.
+        turn_scheduler(TurnScheduler): Decides who acts next, or None for strictly alternating turns.
+        floor_store(FloorStore): Floors the player has left, or None if they aren't kept.
+        floor_pregenerator(FloorPregenerator): Generates the next floor in the background, or None.
+        camera(Camera): The part of the map that's drawn, following the player.
+        renderer(IncrementalRenderer): Draws only what changed since the last frame, or None to draw everything.
+        turn(int): How many player actions have been passed to the enemies.
+        phase_seconds(dict): Time spent so far updating the 'fov', on the 'player' turn and on the 'enemies' turn.
+    """
+
+    def __init__(self, player, entities, game_map, message_log, game_state, constants):
+        """Inits a session from a new or loaded game.
+
+        Args:
+            player(Entity): Player Entity object.
+            entities(list): List of entities on map.
+            game_map(GameMap): TCOD map object used as game map.
+            message_log(MessageLog): MessageLog object list of messages.
+            game_state(Enum): Enum GameState (e.g. PLAYERS_TURN)
+            constants(dict): Dictionary of constant game variables.
+        """
+
+        self.player = player
+        self.entities = entities
+        self.game_map = game_map
+        self.message_log = message_log
+        self.game_state = game_state
+        self.previous_game_state = game_state
+        self.constants = constants
+
+        self.fov_recompute = True
+        self.fov_map = initialize_fov(game_map)
+        self.fov_cache = FovCache(constants['fov_cache_bytes'])
+
+        self.targeting_item = None
+
+        # Without a TurnScheduler, the player and the awake monsters simply take turns.
+        self.turn_scheduler = None
+        if constants['energy_turns']:
+            self.turn_scheduler = TurnScheduler(player)
+
+        self.floor_store = None
+        if constants['keep_visited_floors']:
+            self.floor_store = FloorStore(constants['floor_store_hot_floors'], constants['floor_store_memory_budget'])
+
+        self.floor_pregenerator = None
+        if constants['pregenerate_floors']:
+            self.floor_pregenerator = FloorPregenerator()
+            self.floor_pregenerator.schedule(game_map, constants)
+
+        self.camera = Camera(constants['camera_width'], constants['camera_height'])
+
+        self.renderer = None
+        if constants['incremental_rendering']:
+            self.renderer = IncrementalRenderer()
+
+        self.turn = 0
+        self.phase_seconds = {'fov': 0.0, 'player': 0.0, 'enemies': 0.0}
+
+    def close(self):
+        """Shuts down the floor store and the background floor generator."""
+
+        if self.floor_store is not None:
+            self.floor_store.close()
+        if self.floor_pregenerator:
+            self.floor_pregenerator.shutdown()
+
+    def update_fov(self):
+        """Computes the player's FOV if they moved, marks what they see as explored, and wakes monsters in sight."""
+
+        if self.fov_recompute:
+            start = time.perf_counter()
+            game_map = self.game_map
+
+            recompute_fov(self.fov_map, self.player.x, self.player.y, self.constants['fov_radius'],
+                          self.constants['fov_light_walls'], self.constants['fov_algorithm'], self.fov_cache,
+                          game_map.version)
+            game_map.update_explored(self.fov_map)
+            game_map.actors.wake_in_fov(self.fov_map, game_map.entity_index)
+
+            self.fov_recompute = False
+            self.phase_seconds['fov'] += time.perf_counter() - start
+            return True
+
+        return False
+
+    def render(self, con, panel, mouse, fov_recompute=True):
+        """Draws the game onto the consoles, with the IncrementalRenderer or with render_all.
+
+        The camera follows the player first. With render_all, clear_all
+        has to erase the entities after the frame is shown.
+
+        Args:
+            con(Console): Console used to display whole game.
+            panel(Console): Console used to display messages and UI info.
+            mouse(Mouse): tcod Mouse object, for naming what's under it.
+            fov_recompute(bool): Has the FOV changed since the last draw?
+        """
+
+        constants = self.constants
+
+        camera_moved = self.camera.follow(self.player.x, self.player.y, self.game_map.width, self.game_map.height)
+
+        if self.renderer:
+            self.renderer.render(con, panel, self.entities, self.player, self.game_map, self.fov_map, fov_recompute,
+                                 self.message_log, constants['screen_width'], constants['screen_height'],
+                                 constants['bar_width'], constants['panel_height'], constants['panel_y'], mouse,
+                                 constants['colors'], self.game_state, self.camera)
+            return
+
+        # Everything on the map console is in the wrong place once the camera moves.
+        if camera_moved:
+            con.clear()
+            fov_recompute = True
+
+        render_all(con, panel, self.entities, self.player, self.game_map, self.fov_map, fov_recompute,
+                   self.message_log, constants['screen_width'], constants['screen_height'], constants['bar_width'],
+                   constants['panel_height'], constants['panel_y'], mouse, constants['colors'], self.game_state,
+                   self.camera)
+
+    def step(self, action, mouse_action=None):
+        """Plays one action, and the enemies' turns if it used up the player's turn.
+
+        Args:
+            action(dict): What the player does, in the form handle_keys returns.
+            mouse_action(dict): Mouse clicks, in the form handle_mouse returns.
+
+        Returns:
+            events(list): Every result dictionary from the player's and the
+                enemies' turns, in order, plus {'new_floor': dungeon level}
+                when the player takes the stairs and {'exit': True} when they
+                leave the game.
+        """
+
+        if mouse_action is None:
+            mouse_action = {}
+
+        self.update_fov()
+
+        start = time.perf_counter()
+
+        player = self.player
+        game_map = self.game_map
+        message_log = self.message_log
+        constants = self.constants
+        game_state = self.game_state
+
+        events = []
+
+        move = action.get('move')
+        wait = action.get('wait')
+        pickup = action.get('pickup')
+        show_inventory = action.get('show_inventory')
+        drop_inventory = action.get('drop_inventory')
+        inventory_index = action.get('inventory_index')
+        take_stairs = action.get('take_stairs')
+        level_up = action.get('level_up')
+        show_character_screen = action.get('show_character_screen')
+        exit = action.get('exit')
+
+        left_click = mouse_action.get('left_click')
+        right_click = mouse_action.get('right_click')
+
+        player_turn_results = []
+
+        if move and game_state == GameStates.PLAYERS_TURN:
+            dx, dy = move
+            destination_x = player.x + dx
+            destination_y = player.y + dy
+
+            if not game_map.is_blocked(destination_x, destination_y):
+                target = game_map.entity_index.get_blocking_entity_at(destination_x, destination_y)
+
+                if target:
+                    attack_results = player.fighter.attack(target)
+                    player_turn_results.extend(attack_results)
+                    game_map.actors.make_noise(player.x, player.y, constants['noise_radius'], game_map.entity_index)
+                else:
+                    player.move(dx, dy)
+                    self.fov_recompute = True
+
+                game_state = GameStates.ENEMY_TURN
+
+        elif wait:
+            game_state = GameStates.ENEMY_TURN
+            if player.fighter.hp < player.fighter.max_hp:
+                player.fighter.hp += 1
+
+        elif pickup and game_state == GameStates.PLAYERS_TURN:
+            for entity in game_map.entity_index.entities_at(player.x, player.y):
+                if entity.item:
+                    pickup_results = player.inventory.add_item(entity)
+                    player_turn_results.extend(pickup_results)
+
+                    break
+            else:
+                message_log.add_message(Message('There is nothing here to pick up.', libtcod.yellow))
+
+        if show_inventory:
+            self.previous_game_state = game_state
+            game_state = GameStates.SHOW_INVENTORY
+
+        if drop_inventory:
+            self.previous_game_state = game_state
+            game_state = GameStates.DROP_INVENTORY
+
+        if inventory_index is not None and self.previous_game_state != GameStates.PLAYER_DEAD and inventory_index < len(
+                player.inventory.items):
+            item = player.inventory.items[inventory_index]
+
+            if game_state == GameStates.SHOW_INVENTORY:
+                player_turn_results.extend(player.inventory.use(item, entities=self.entities, fov_map=self.fov_map,
+                                                                game_map=game_map))
+            elif game_state == GameStates.DROP_INVENTORY:
+                player_turn_results.extend(player.inventory.drop_item(item))
+
+        if take_stairs and game_state == GameStates.PLAYERS_TURN:
+            for entity in game_map.entity_index.entities_at(player.x, player.y):
+                if entity.stairs:
+                    self.entities = game_map.next_floor(player, message_log, constants, self.floor_pregenerator,
+                                                        self.floor_store, self.entities)
+                    self.fov_map = initialize_fov(game_map)
+                    self.fov_recompute = True
+
+                    if self.turn_scheduler:
+                        self.turn_scheduler.clear()
+
+                    if self.floor_pregenerator:
+                        self.floor_pregenerator.schedule(game_map, constants)
+
+                    if self.renderer:
+                        self.renderer.invalidate()
+
+                    events.append({'new_floor': game_map.dungeon_level})
+
+                    break
+            else:
+                message_log.add_message(Message('There are no stairs here.', libtcod.yellow))
+
+        if level_up:
+            if level_up == 'hp':
+                player.fighter.base_max_hp += 20
+                player.fighter.hp += 20
+            elif level_up == 'str':
+                player.fighter.base_power += 1
+            elif level_up == 'def':
+                player.fighter.base_defense += 1
+
+            game_state = self.previous_game_state
+
+        if show_character_screen:
+            self.previous_game_state = game_state
+            game_state = GameStates.CHARACTER_SCREEN
+
+        if game_state == GameStates.TARGETING:
+            if left_click:
+                target_x, target_y = left_click
+
+                item_use_results = player.inventory.use(self.targeting_item, entities=self.entities,
+                                                        fov_map=self.fov_map, game_map=game_map, target_x=target_x,
+                                                        target_y=target_y)
+                player_turn_results.extend(item_use_results)
+            elif right_click:
+                player_turn_results.append({'targeting_cancelled': True})
+
+        if exit:
+            if game_state in (GameStates.SHOW_INVENTORY, GameStates.DROP_INVENTORY, GameStates.CHARACTER_SCREEN):
+                game_state = self.previous_game_state
+            elif game_state == GameStates.TARGETING:
+                player_turn_results.append({'targeting_cancelled': True})
+            else:
+                events.append({'exit': True})
+
+        # Check what happened on the player's turn and react accordingly.
+        for player_turn_result in player_turn_results:
+            message = player_turn_result.get('message')
+            dead_entity = player_turn_result.get('dead')
+            item_added = player_turn_result.get('item_added')
+            item_consumed = player_turn_result.get('consumed')
+            item_dropped = player_turn_result.get('item_dropped')
+            equip = player_turn_result.get('equip')
+            targeting = player_turn_result.get('targeting')
+            targeting_cancelled = player_turn_result.get('targeting_cancelled')
+            xp = player_turn_result.get('xp')
+
+            if message:
+                message_log.add_message(message)
+
+            if dead_entity:
+                if dead_entity == player:
+                    message, game_state = kill_player(dead_entity)
+                else:
+                    message = kill_monster(dead_entity)
+                    game_map.actors.remove(dead_entity)
+
+                message_log.add_message(message)
+
+            if item_added:
+                self.entities.remove(item_added)
+                game_map.entity_index.remove(item_added)
+
+                game_state = GameStates.ENEMY_TURN
+
+            if item_consumed:
+                game_state = GameStates.ENEMY_TURN
+
+            if targeting:
+                self.previous_game_state = GameStates.PLAYERS_TURN
+                game_state = GameStates.TARGETING
+
+                self.targeting_item = targeting
+
+                message_log.add_message(self.targeting_item.item.targeting_message)
+
+            if targeting_cancelled:
+                game_state = self.previous_game_state
+
+                message_log.add_message(Message('Targeting cancelled.'))
+
+            if xp:
+                leveled_up = player.level.add_xp(xp)
+                message_log.add_message(Message('You gain {0} XP.'.format(xp)))
+
+                if leveled_up:
+                    message_log.add_message(Message('Your fighting skills improve! You reached level {0}'.format(
+                        player.level.current_level) + '!', libtcod.yellow))
+                    self.previous_game_state = game_state
+                    game_state = GameStates.LEVEL_UP
+
+            if item_dropped:
+                self.entities.append(item_dropped)
+                game_map.entity_index.add(item_dropped)
+
+                game_state = GameStates.ENEMY_TURN
+
+            if equip:
+                equip_results = player.equipment.toggle_equip(equip)
+
+                for equip_result in equip_results:
+                    equipped = equip_result.get('equipped')
+                    dequipped = equip_result.get('unequipped')
+
+                    if equipped:
+                        message_log.add_message(Message('You equip the {0}'.format(equipped.name)))
+
+                    if dequipped:
+                        message_log.add_message(Message('You unequip the {0}'.format(dequipped.name)))
+
+                game_state = GameStates.ENEMY_TURN
+
+        events.extend(player_turn_results)
+
+        self.phase_seconds['player'] += time.perf_counter() - start
+
+        if game_state == GameStates.ENEMY_TURN:
+            start = time.perf_counter()
+
+            game_state = self.enemy_turn(events)
+            self.turn += 1
+
+            self.phase_seconds['enemies'] += time.perf_counter() - start
+
+        self.game_state = game_state
+
+        return events
+
+    def enemy_turn(self, events):
+        """Runs the monsters' turns after the player's.
+
+        Args:
+            events(list): Where to add the monsters' results.
+
+        Returns:
+            game_state(Enum): PLAYERS_TURN, or PLAYER_DEAD if a monster killed the player.
+        """
+
+        player = self.player
+        game_map = self.game_map
+        message_log = self.message_log
+        game_state = GameStates.ENEMY_TURN
+
+        game_map.navigation.update(flow_target=player if self.constants['flow_field_pathing'] else None)
+
+        # Only awake monsters take turns. The ones with nothing to do go dormant until they're seen or hear something.
+        if self.turn_scheduler:
+            enemies = self.turn_scheduler.enemy_turns(game_map.actors)
+        else:
+            enemies = game_map.actors.awake_actors()
+
+        for entity in enemies:
+            if entity.ai.is_dormant(self.fov_map):
+                game_map.actors.sleep(entity)
+            else:
+                enemy_turn_results = entity.ai.take_turn(player, self.fov_map, game_map, self.entities)
+                events.extend(enemy_turn_results)
+
+                for enemy_turn_result in enemy_turn_results:
+                    message = enemy_turn_result.get('message')
+                    dead_entity = enemy_turn_result.get('dead')
+
+                    if message:
+                        message_log.add_message(message)
+
+                    if dead_entity:
+                        if dead_entity == player:
+                            message, game_state = kill_player(dead_entity)
+                        else:
+                            message = kill_monster(dead_entity)
+                            game_map.actors.remove(dead_entity)
+
+                        message_log.add_message(message)
+
+                        if game_state == GameStates.PLAYER_DEAD:
+                            break
+
+                if game_state == GameStates.PLAYER_DEAD:
+                    break
+
+        else:
+            game_state = GameStates.PLAYERS_TURN
+
+        return game_state
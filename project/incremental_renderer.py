@@ -0,0 +1,256 @@
+"""
+Draws the game like render_all, but only the parts of the screen that changed since the last frame.
+
+render_all redraws every entity, blits the whole map console, repaints the whole panel and then has clear_all erase
+every entity again, every frame. Most frames almost nothing changes: a monster takes a step, a message arrives, the
+health bar moves. IncrementalRenderer keeps what it drew last time and only touches the cells that differ:
+
+    - the tiles are repainted when the FOV changes (render_tiles),
+    - an entity's old and new cells are redrawn when it moves, changes its looks, or comes into or out of sight,
+    - the panel is repainted when the messages, HP, dungeon level or the names under the mouse change,
+
+and then only the rectangle that actually changed is blitted to the root console. If nothing changed, nothing is
+blitted at all. cells_redrawn says how many cells were redrawn in the last frame.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import numpy as np
+import tcod as libtcod
+
+from project.game_states import GameStates
+from project.render_functions import (entities_in_render_order, get_names_under_mouse, render_menu, render_panel,
+                                      render_tiles)
+
+# Menus are blitted over the map with a translucent background, so the screen under them is redrawn in full.
+MENU_STATES = (GameStates.SHOW_INVENTORY, GameStates.DROP_INVENTORY, GameStates.LEVEL_UP, GameStates.CHARACTER_SCREEN)
+
+
+class IncrementalRenderer:
+    """Draws the game onto the consoles, redrawing only what changed since the last frame.
+
+    Draws exactly what render_all would. It owns the contents of the map
+    console: call invalidate() after something else clears or draws on it,
+    e.g. when the player goes to a new floor.
+
+    Attributes:
+        full_redraw(bool): Redraw everything next frame?
+        drawn_entities(dict): (x, y, char, color, render order) of each entity drawn on the map console.
+        screen(ndarray): Copy of the map console's cells as they were last blitted, or None.
+        panel_screen(ndarray): Copy of the panel console's cells as they were last blitted, or None.
+        panel_key(tuple): Everything shown on the panel when it was last painted.
+        game_state(Enum): The GameState of the last frame.
+        view(tuple): The map area the camera showed last frame, or None.
+        cells_redrawn(int): Cells redrawn on the screen in the last frame.
+        frames(int): Frames rendered so far.
+        total_cells_redrawn(int): Cells redrawn on the screen over all frames.
+    """
+
+    def __init__(self):
+        """Inits the renderer, with a full redraw for the first frame."""
+
+        self.frames = 0
+        self.cells_redrawn = 0
+        self.total_cells_redrawn = 0
+
+        self.invalidate()
+
+    def invalidate(self):
+        """Forgets what's on the screen, so the next frame clears the map console and redraws everything."""
+
+        self.full_redraw = True
+        self.drawn_entities = {}
+        self.screen = None
+        self.panel_screen = None
+        self.panel_key = None
+        self.game_state = None
+        self.view = None
+
+    def render(self, con, panel, entities, player, game_map, fov_map, fov_recompute, message_log, screen_width,
+               screen_height, bar_width, panel_height, panel_y, mouse, colors, game_state, camera=None):
+        """Brings the screen up to date, like render_all but only redrawing what changed.
+
+        Takes the same arguments as render_all. There's no need for
+        clear_all afterwards; entities that moved away are erased here.
+        When the camera moves, everything is redrawn.
+
+        Returns:
+            (int): How many cells were redrawn. 0 means the screen didn't change.
+        """
+
+        view = camera.map_area if camera else None
+
+        if view != self.view:
+            self.invalidate()
+            self.view = view
+
+        if self.full_redraw:
+            con.clear()
+            fov_recompute = True
+
+        if fov_recompute:
+            render_tiles(con, game_map, fov_map, colors, camera)
+
+        # Only look for changed cells on the consoles that were drawn on.
+        con_drawn = self.draw_entities(con, game_map, fov_map, camera) or fov_recompute
+        panel_drawn = False
+
+        panel_key = (tuple((message.text, tuple(message.color)) for message in message_log.messages),
+                     player.fighter.hp, player.fighter.max_hp, game_map.dungeon_level,
+                     get_names_under_mouse(mouse, game_map.entity_index, fov_map, camera))
+
+        if panel_key != self.panel_key:
+            render_panel(panel, player, game_map, fov_map, message_log, bar_width, mouse, camera)
+            self.panel_key = panel_key
+            panel_drawn = True
+
+        # Menus are drawn straight onto the root console, so open, close and
+        # redraw them over a freshly blitted screen.
+        full = self.full_redraw or game_state != self.game_state or game_state in MENU_STATES
+
+        cells = 0
+
+        if full:
+            libtcod.console_blit(con, 0, 0, screen_width, screen_height, 0, 0, 0)
+            self.screen = self.snapshot(con)
+            cells += screen_width * screen_height
+
+            render_menu(con, player, game_state, screen_width, screen_height)
+
+            libtcod.console_blit(panel, 0, 0, screen_width, panel_height, 0, 0, panel_y)
+            self.panel_screen = self.snapshot(panel)
+            cells += screen_width * panel_height
+        else:
+            map_area = None
+            if con_drawn:
+                map_cells, map_area = self.blit_changes(con, self.screen, 0)
+                cells += map_cells
+
+            # The map console is as big as the screen, so it may have covered part of the panel.
+            panel_covered = map_area is not None and map_area[3] > panel_y
+            if panel_drawn or panel_covered:
+                panel_cells, _ = self.blit_changes(panel, self.panel_screen, panel_y, force=panel_covered)
+                cells += panel_cells
+
+        self.full_redraw = False
+        self.game_state = game_state
+
+        self.frames += 1
+        self.cells_redrawn = cells
+        self.total_cells_redrawn += cells
+
+        return cells
+
+    def draw_entities(self, con, game_map, fov_map, camera=None):
+        """Redraws the cells of the entities that moved, changed their looks, or came into or out of sight.
+
+        Args:
+            con(Console): A Console object used for the map.
+            game_map(Map): The Map object used for the actual game.
+            fov_map(Map): The Map object used to calculate FOV.
+            camera(Camera): The part of the map on the screen, or None if the map is drawn from the top left corner.
+
+        Returns:
+            (bool): Was anything redrawn?
+        """
+
+        visible = fov_map.fov
+        explored = game_map.explored
+        drawn_entities = self.drawn_entities
+
+        drawn = {}
+        dirty = set()
+
+        for entity in entities_in_render_order(game_map, camera):
+            if camera is not None and not camera.in_view(entity.x, entity.y):
+                continue
+
+            # Same rule as draw_entity.
+            if visible[entity.y, entity.x] or (entity.stairs and explored[entity.x, entity.y]):
+                looks = (entity.x, entity.y, entity.char, tuple(entity.color), entity.render_order.value)
+                drawn[entity] = looks
+
+                old_looks = drawn_entities.get(entity)
+
+                if old_looks != looks:
+                    dirty.add((entity.x, entity.y))
+
+                    if old_looks:
+                        dirty.add(old_looks[:2])
+
+        for entity, old_looks in drawn_entities.items():
+            if entity not in drawn:
+                dirty.add(old_looks[:2])
+
+        self.drawn_entities = drawn
+
+        if not dirty:
+            return False
+
+        # The entity that ends up on top of each dirty cell: they came in render
+        # order, so the last one wins, like in render_all.
+        on_top = {}
+
+        for looks in drawn.values():
+            cell = looks[:2]
+
+            if cell in dirty:
+                on_top[cell] = looks
+
+        for cell in dirty:
+            looks = on_top.get(cell)
+            x, y = camera.to_screen(*cell) if camera else cell
+
+            if looks:
+                libtcod.console_set_default_foreground(con, looks[3])
+                libtcod.console_put_char(con, x, y, looks[2], libtcod.BKGND_NONE)
+            else:
+                libtcod.console_put_char(con, x, y, ' ', libtcod.BKGND_NONE)
+
+        return True
+
+    @staticmethod
+    def snapshot(console):
+        """Returns a copy of a console's cells."""
+
+        return console.rgba.copy()
+
+    @staticmethod
+    def blit_changes(console, screen, dest_y, force=False):
+        """Blits the part of a console that changed since it was last blitted, and remembers what was blitted.
+
+        Args:
+            console(Console): The console to blit to the root console, at x 0.
+            screen(ndarray): Copy of the console's cells as they were last blitted. Updated in place.
+            dest_y(int): Where the console goes on the root console.
+            force(bool): Blit the whole console, changed or not.
+
+        Returns:
+            cells(int): How many cells changed.
+            area(tuple): The (x1, y1, x2, y2) rectangle blitted, in root console cells, or None.
+        """
+
+        cells = console.rgba
+
+        if force:
+            changed = np.ones(cells.shape, dtype=bool)
+        else:
+            # Each cell is three 32-bit words: the character, the foreground and the background.
+            now = cells.view(np.uint32).reshape(cells.shape + (3,))
+            then = screen.view(np.uint32).reshape(cells.shape + (3,))
+            changed = (now[..., 0] != then[..., 0]) | (now[..., 1] != then[..., 1]) | (now[..., 2] != then[..., 2])
+
+        rows = np.flatnonzero(changed.any(axis=1))
+
+        if not rows.size:
+            return 0, None
+
+        columns = np.flatnonzero(changed.any(axis=0))
+        x1, x2 = int(columns[0]), int(columns[-1]) + 1
+        y1, y2 = int(rows[0]), int(rows[-1]) + 1
+
+        libtcod.console_blit(console, x1, y1, x2 - x1, y2 - y1, 0, x1, dest_y + y1)
+
+        screen[y1:y2, x1:x2] = cells[y1:y2, x1:x2]
+
+        return int(changed.sum()), (x1, dest_y + y1, x2, dest_y + y2)
@@ -0,0 +1,163 @@
+"""
+The monsters on a floor that can act, split into awake and dormant.
+
+The enemy phase only runs the awake ones. A monster that has nothing to do goes dormant and costs nothing per turn
+until the player sees it or it hears a noise, so a turn costs about as much as the monsters around the player, no
+matter how many entities (corpses, items, sleeping monsters) the floor holds.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import numpy as np
+
+
+class ActorSet:
+    """Every entity with an AI on a floor.
+
+    Monsters start out dormant. Awake and dormant are kept as dicts (with
+    None values) rather than sets so everything about them is ordered.
+
+    Attributes:
+        order(dict): Entity -> the order it was added in. Awake monsters take their turns in this order.
+        awake(dict): Entities that take turns.
+        dormant(dict): Entities that don't, until they're woken.
+        added(int): How many entities have ever been added, for numbering the next one.
+    """
+
+    def __init__(self, entities=()):
+        """Inits the set with the AI-bearing entities out of some entities.
+
+        Args:
+            entities(iterable): Entities to add the ones with an AI from, in turn order.
+        """
+
+        self.order = {}
+        self.awake = {}
+        self.dormant = {}
+        self.added = 0
+
+        for entity in entities:
+            if entity.ai:
+                self.add(entity)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, entity):
+        return entity in self.order
+
+    def add(self, entity, awake=False):
+        """Adds an entity, after every entity already in the set.
+
+        Args:
+            entity(Entity): The entity to add.
+            awake(bool): Should it start out awake?
+        """
+
+        self.order[entity] = self.added
+        self.added += 1
+
+        if awake:
+            self.awake[entity] = None
+        else:
+            self.dormant[entity] = None
+
+    def remove(self, entity):
+        """Removes an entity, e.g. when it dies. Does nothing if it isn't in the set.
+
+        Args:
+            entity(Entity): The entity to remove.
+        """
+
+        self.order.pop(entity, None)
+        self.awake.pop(entity, None)
+        self.dormant.pop(entity, None)
+
+    def wake(self, entity):
+        """Wakes a dormant entity up.
+
+        Args:
+            entity(Entity): The entity to wake.
+
+        Returns:
+            (bool): True if it was dormant.
+        """
+
+        if entity in self.dormant:
+            del self.dormant[entity]
+            self.awake[entity] = None
+            return True
+
+        return False
+
+    def sleep(self, entity):
+        """Makes an awake entity dormant.
+
+        Args:
+            entity(Entity): The entity to put to sleep.
+        """
+
+        if entity in self.awake:
+            del self.awake[entity]
+            self.dormant[entity] = None
+
+    def awake_actors(self):
+        """Returns the awake entities in turn order.
+
+        Returns:
+            (list): A new list, so entities can be put to sleep or removed while going through it.
+        """
+
+        return sorted(self.awake, key=self.order.__getitem__)
+
+    def wake_in_fov(self, fov_map, entity_index):
+        """Wakes every dormant entity in a field of view.
+
+        Looks up whichever is smaller: the dormant entities, or the
+        entities on the visible cells.
+
+        Args:
+            fov_map(Map): The computed FOV to check.
+            entity_index(EntityIndex): Where the entities on the map are.
+        """
+
+        visible = fov_map.fov
+
+        if len(self.dormant) <= np.count_nonzero(visible):
+            woken = [entity for entity in self.dormant if visible[entity.y, entity.x]]
+        else:
+            woken = []
+
+            for y, x in zip(*np.nonzero(visible)):
+                woken.extend(entity for entity in entity_index.entities_at(x, y) if entity in self.dormant)
+
+        for entity in woken:
+            self.wake(entity)
+
+    def make_noise(self, x, y, radius, entity_index):
+        """Wakes every dormant entity that can hear a noise, and tells its AI where the noise came from.
+
+        Args:
+            x(int): x coordinate of the noise.
+            y(int): y coordinate of the noise.
+            radius(int): How far away it can be heard.
+            entity_index(EntityIndex): Where the entities on the map are.
+        """
+
+        if radius <= 0:
+            return
+
+        if len(self.dormant) <= (2 * radius + 1) ** 2:
+            nearby = list(self.dormant)
+        else:
+            nearby = []
+
+            for cell_x in range(x - radius, x + radius + 1):
+                for cell_y in range(y - radius, y + radius + 1):
+                    nearby.extend(entity for entity in entity_index.entities_at(cell_x, cell_y)
+                                  if entity in self.dormant)
+
+        for entity in nearby:
+            if entity.distance(x, y) <= radius:
+                self.wake(entity)
+                entity.ai.hear_noise(x, y)
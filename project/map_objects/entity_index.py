@@ -0,0 +1,181 @@
+"""
+A spatial hash of entities, so "what's at (x, y)?" doesn't have to scan the whole entities list.
+
+The index also sorts the entities into render layers: one bucket per RenderOrder, split into square chunks of the map.
+Drawing walks the layers bottom to top and only looks at the chunks that can be seen, instead of sorting the whole
+entities list every frame.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+# Width and height, in cells, of the chunks each render layer is split into.
+CHUNK_SIZE = 16
+
+
+class EntityIndex:
+    """Maps map cells to the entities standing on them.
+
+    Entities added to the index get a reference to it, so Entity.move can
+    keep it up to date. Anything that changes an entity's position some
+    other way (or adds/removes it from the map) has to tell the index.
+
+    Entities have to change their render order through
+    Entity.set_render_order, so the index can move them to the right layer.
+
+    Attributes:
+        cells(dict): (x, y) -> list of the entities on that cell, in the order they were added.
+        layers(dict): RenderOrder -> {(chunk x, chunk y): {entity: None}}, in the order the entities arrived.
+    """
+
+    def __init__(self, entities=()):
+        """Inits the index with some entities.
+
+        Args:
+            entities(iterable): Entities to add right away.
+        """
+
+        self.cells = {}
+        self.layers = {}
+
+        for entity in entities:
+            self.add(entity)
+
+    def __len__(self):
+        return sum(len(cell) for cell in self.cells.values())
+
+    def add(self, entity):
+        """Adds an entity at its current position.
+
+        Args:
+            entity(Entity): The entity to add.
+        """
+
+        self.cells.setdefault((entity.x, entity.y), []).append(entity)
+        self._add_to_layer(entity, entity.render_order, entity.x, entity.y)
+        entity.spatial_index = self
+
+    def remove(self, entity):
+        """Removes an entity from the index.
+
+        Args:
+            entity(Entity): The entity to remove.
+        """
+
+        self._discard(entity, entity.x, entity.y)
+        self._remove_from_layer(entity, entity.render_order, entity.x, entity.y)
+        entity.spatial_index = None
+
+    def move(self, entity, old_x, old_y):
+        """Files an entity under its new position. Called by Entity.move.
+
+        Args:
+            entity(Entity): The entity that moved.
+            old_x(int): x coordinate it moved from.
+            old_y(int): y coordinate it moved from.
+        """
+
+        self._discard(entity, old_x, old_y)
+        self.cells.setdefault((entity.x, entity.y), []).append(entity)
+
+        if (old_x // CHUNK_SIZE, old_y // CHUNK_SIZE) != (entity.x // CHUNK_SIZE, entity.y // CHUNK_SIZE):
+            self._remove_from_layer(entity, entity.render_order, old_x, old_y)
+            self._add_to_layer(entity, entity.render_order, entity.x, entity.y)
+
+    def change_render_order(self, entity, old_render_order):
+        """Moves an entity to the layer of its new render order. Called by Entity.set_render_order.
+
+        Args:
+            entity(Entity): The entity whose render order changed.
+            old_render_order(RenderOrder): The layer it was in.
+        """
+
+        self._remove_from_layer(entity, old_render_order, entity.x, entity.y)
+        self._add_to_layer(entity, entity.render_order, entity.x, entity.y)
+
+    def _discard(self, entity, x, y):
+        """Takes an entity out of a cell's list, dropping the list if it's empty."""
+
+        cell = self.cells[(x, y)]
+        cell.remove(entity)
+
+        if not cell:
+            del self.cells[(x, y)]
+
+    def _add_to_layer(self, entity, render_order, x, y):
+        """Puts an entity in the chunk of a render layer that holds (x, y)."""
+
+        chunks = self.layers.setdefault(render_order, {})
+        chunks.setdefault((x // CHUNK_SIZE, y // CHUNK_SIZE), {})[entity] = None
+
+    def _remove_from_layer(self, entity, render_order, x, y):
+        """Takes an entity out of the chunk of a render layer that holds (x, y), dropping the chunk if it's empty."""
+
+        chunks = self.layers[render_order]
+        key = (x // CHUNK_SIZE, y // CHUNK_SIZE)
+
+        del chunks[key][entity]
+
+        if not chunks[key]:
+            del chunks[key]
+
+    def in_layer(self, render_order, area=None):
+        """Yields the entities of one render layer, optionally only those in the chunks touching an area.
+
+        The area is only used to skip chunks, so entities just outside it
+        can be yielded too. Within a cell, entities come in the order they
+        arrived in the layer.
+
+        Args:
+            render_order(RenderOrder): The layer.
+            area(tuple): (x1, y1, x2, y2) rectangle of cells, ends exclusive, or None for the whole map.
+        """
+
+        chunks = self.layers.get(render_order)
+
+        if not chunks:
+            return
+
+        if area is None:
+            for chunk in chunks.values():
+                yield from chunk
+
+            return
+
+        x1, y1, x2, y2 = area
+
+        for chunk_x in range(x1 // CHUNK_SIZE, (x2 - 1) // CHUNK_SIZE + 1):
+            for chunk_y in range(y1 // CHUNK_SIZE, (y2 - 1) // CHUNK_SIZE + 1):
+                chunk = chunks.get((chunk_x, chunk_y))
+
+                if chunk:
+                    yield from chunk
+
+    def entities_at(self, x, y):
+        """Returns the entities on a cell.
+
+        Args:
+            x(int): x coordinate.
+            y(int): y coordinate.
+
+        Returns:
+            (tuple): The entities on the cell, possibly none.
+        """
+
+        return tuple(self.cells.get((x, y), ()))
+
+    def get_blocking_entity_at(self, x, y):
+        """Returns the Entity, if any, on a cell that blocks movement.
+
+        Args:
+            x(int): x coordinate.
+            y(int): y coordinate.
+
+        Returns:
+            entity(Entity): An Entity whose 'blocks' is True, or None.
+        """
+
+        for entity in self.cells.get((x, y), ()):
+            if entity.blocks:
+                return entity
+
+        return None
@@ -0,0 +1,78 @@
+"""
+Generates the next floor of the dungeon in the background, so taking the stairs doesn't have to wait for make_map.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+from concurrent.futures import ThreadPoolExecutor
+
+from project.map_objects.game_map import generate_floor
+
+
+class FloorPregenerator:
+    """Runs generate_floor in a worker ahead of time.
+
+    Floors are keyed by (seed, dungeon_level). Since generate_floor only
+    depends on those (and the constants), the floor that comes back is the
+    same one next_floor would have generated on the spot.
+
+    Attributes:
+        executor(Executor): The concurrent.futures executor doing the work.
+        pending(dict): Maps (seed, dungeon_level) to the Future of that floor.
+    """
+
+    def __init__(self, executor=None):
+        """Inits the pregenerator.
+
+        Args:
+            executor(Executor): Any concurrent.futures executor. Defaults to
+                a single worker thread. A ProcessPoolExecutor works too, as
+                everything generate_floor returns can be pickled.
+        """
+
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='floor-pregenerator')
+
+        self.executor = executor
+        self.pending = {}
+
+    def schedule(self, game_map, constants):
+        """Starts generating the floor below the current one, if it isn't already.
+
+        Args:
+            game_map(GameMap): The map the player is currently on.
+            constants(dict): Dictionary containing game's constant variables.
+        """
+
+        key = (game_map.seed, game_map.dungeon_level + 1)
+
+        if key not in self.pending:
+            self.pending[key] = self.executor.submit(generate_floor, key[0], key[1], constants)
+
+    def take(self, seed, dungeon_level):
+        """Hands over a scheduled floor, waiting for it if it isn't done yet.
+
+        Args:
+            seed(int): The game's seed.
+            dungeon_level(int): Which floor is wanted.
+
+        Returns:
+            (tuple): The (floor_map, floor_entities) from generate_floor, or
+                None if that floor was never scheduled.
+        """
+
+        future = self.pending.pop((seed, dungeon_level), None)
+
+        if future is None:
+            return None
+
+        return future.result()
+
+    def shutdown(self):
+        """Cancels any floors that haven't started and stops the executor."""
+
+        for future in self.pending.values():
+            future.cancel()
+
+        self.pending.clear()
+        self.executor.shutdown(wait=False)
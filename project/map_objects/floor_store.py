@@ -0,0 +1,159 @@
+"""
+Keeps floors the player has left, so they can be returned to without generating them again.
+
+Recently visited floors stay in memory as they are. Older ones are pickled and compressed, and once the compressed
+floors go over a byte budget the oldest of them are written out to disk.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import os
+import pickle
+import shutil
+import tempfile
+import zlib
+from collections import OrderedDict
+
+
+class FloorStore:
+    """A least-recently-used store of floors, keyed by dungeon level.
+
+    Floors are stored in the same (floor_map, floor_entities) form that
+    generate_floor returns, so GameMap.load_floor can swap them back in.
+
+    Attributes:
+        hot_floors(int): How many floors to keep uncompressed in memory.
+        memory_budget(int): Max bytes of compressed floors to keep in memory.
+        directory(str): Where floors are written once they're evicted to disk.
+        hot(OrderedDict): dungeon_level -> (floor_map, floor_entities), oldest first.
+        cold(OrderedDict): dungeon_level -> compressed bytes, oldest first.
+        on_disk(dict): dungeon_level -> path of the file holding the compressed floor.
+        cold_bytes(int): Total size of everything in cold.
+    """
+
+    def __init__(self, hot_floors=2, memory_budget=32 * 1024 * 1024, directory=None):
+        """Inits an empty floor store.
+
+        Args:
+            hot_floors(int): How many floors to keep uncompressed in memory.
+            memory_budget(int): Max bytes of compressed floors to keep in memory.
+            directory(str): Where to write evicted floors. Defaults to a
+                temporary directory that's made the first time it's needed.
+        """
+
+        self.hot_floors = hot_floors
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self._owns_directory = directory is None
+
+        self.hot = OrderedDict()
+        self.cold = OrderedDict()
+        self.on_disk = {}
+        self.cold_bytes = 0
+
+    def __contains__(self, dungeon_level):
+        return dungeon_level in self.hot or dungeon_level in self.cold or dungeon_level in self.on_disk
+
+    def __len__(self):
+        return len(self.hot) + len(self.cold) + len(self.on_disk)
+
+    def put(self, dungeon_level, floor_map, floor_entities):
+        """Stores a floor, then moves older floors down to compressed or disk storage if needed.
+
+        Args:
+            dungeon_level(int): Which floor this is.
+            floor_map(GameMap): The floor's map.
+            floor_entities(list): The floor's entities, with the stand-in player first.
+        """
+
+        self.discard(dungeon_level)
+        self.hot[dungeon_level] = (floor_map, floor_entities)
+
+        while len(self.hot) > self.hot_floors:
+            level, floor = self.hot.popitem(last=False)
+            data = zlib.compress(pickle.dumps(floor, pickle.HIGHEST_PROTOCOL))
+
+            self.cold[level] = data
+            self.cold_bytes += len(data)
+
+        while self.cold_bytes > self.memory_budget and self.cold:
+            level, data = self.cold.popitem(last=False)
+            self.cold_bytes -= len(data)
+
+            path = os.path.join(self._get_directory(), 'floor_{0}.bin'.format(level))
+            with open(path, 'wb') as floor_file:
+                floor_file.write(data)
+
+            self.on_disk[level] = path
+
+    def take(self, dungeon_level):
+        """Removes a floor from the store and returns it.
+
+        Args:
+            dungeon_level(int): Which floor is wanted.
+
+        Returns:
+            (tuple): The (floor_map, floor_entities) that were stored, or None
+                if the floor isn't in the store.
+        """
+
+        if dungeon_level in self.hot:
+            return self.hot.pop(dungeon_level)
+
+        if dungeon_level in self.cold:
+            data = self.cold.pop(dungeon_level)
+            self.cold_bytes -= len(data)
+
+            return pickle.loads(zlib.decompress(data))
+
+        if dungeon_level in self.on_disk:
+            path = self.on_disk.pop(dungeon_level)
+
+            with open(path, 'rb') as floor_file:
+                data = floor_file.read()
+
+            os.remove(path)
+
+            return pickle.loads(zlib.decompress(data))
+
+        return None
+
+    def discard(self, dungeon_level):
+        """Forgets a floor, wherever it's stored.
+
+        Args:
+            dungeon_level(int): Which floor to forget.
+        """
+
+        self.hot.pop(dungeon_level, None)
+
+        if dungeon_level in self.cold:
+            self.cold_bytes -= len(self.cold.pop(dungeon_level))
+
+        if dungeon_level in self.on_disk:
+            os.remove(self.on_disk.pop(dungeon_level))
+
+    def close(self):
+        """Forgets every floor and deletes any files written to disk."""
+
+        self.hot.clear()
+        self.cold.clear()
+        self.cold_bytes = 0
+
+        for path in self.on_disk.values():
+            if os.path.exists(path):
+                os.remove(path)
+
+        self.on_disk.clear()
+
+        if self._owns_directory and self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def _get_directory(self):
+        """Returns the directory for evicted floors, making a temporary one if needed."""
+
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix='floor_store_')
+
+        return self.directory
@@ -1,315 +1,599 @@
-#  Coded by Philip Hofman, Copyright (c) 2020.
-
-from random import randint
-import tcod as libtcod
-
-from project.entity import Entity
-from project.game_messages import Message
-from project.render_functions import RenderOrder
-from project.item_functions import heal, cast_lightning, cast_fireball, cast_confuse
-from project.random_utils import random_choice_from_dict, from_dungeon_level
-
-from project.components.ai import BasicMonster
-from project.components.fighter import Fighter
-from project.components.item import Item
-from project.components.stairs import Stairs
-from project.components.equipment import EquipmentSlots
-from project.components.equippable import Equippable
-
-from project.map_objects.tile import Tile
-from project.map_objects.rectangle import Rect
-
-
-class GameMap:
-    """GameMap handles the creation of a random map by creating rooms, tunnels, and placing entities."""
-
-    def __init__(self, width, height, dungeon_level=1):
-        """Inits values for the game map.
-
-        Args:
-            width(int): An integer defining the width of the map.
-            height(int): An integer defining the height of the map.
-            dungeon_level(int): The current dungeon level.
-        """
-
-        self.width = width
-        self.height = height
-        self.tiles = self.initialize_tiles()
-
-        self.dungeon_level = dungeon_level
-
-    def initialize_tiles(self):
-        """Creates a 2D array of tiles with own width and height.
-
-        By default every tile blocks movement, since a different function
-        (make_map) is responsible for "digging out" the rooms and tunnels.
-
-        Returns:
-            tiles(list): A 2D array of tiles with the dimensions of the GameMap object.
-        """
-
-        tiles = [[Tile(True) for y in range(self.height)] for x in range(self.width)]
-
-        return tiles
-
-    def make_map(self, max_rooms, room_min_size, room_max_size, map_width, map_height, player, entities):
-        """Creates a a random map and populates it with monsters and the player.
-
-        Starts by creating a random room somewhere in the map,
-        plopping the player in the center of it, then creating
-        new rooms, connecting them with tunnels, and spawning
-        monsters in them.
-
-        Args:
-            max_rooms(int): Max amount of rooms in this map.
-            room_min_size(int): How small a room can be.
-            room_max_size(int): How big a room can be.
-            map_width(int): Width of the map.
-            map_height(int): Height of a map.
-            player(Entity): The player's Entity object.
-            entities(list): A list containing all the objects on the map.
-        """
-
-        rooms = []
-        num_rooms = 0
-
-        center_of_last_room_x = None
-        center_of_last_room_y = None
-
-        for r in range(max_rooms):
-            # Random width and height
-            w = randint(room_min_size, room_max_size)
-            h = randint(room_min_size, room_max_size)
-            # Random position without going out of the boundaries of the map
-            x = randint(0, map_width - w - 1)
-            y = randint(0, map_height - h - 1)
-
-            # "Rect" class makes rectangles easier to work with
-            new_room = Rect(x, y, w, h)
-
-            # Run through the other rooms and see if they intersect with this one
-            for other_room in rooms:
-                if new_room.intersect(other_room):
-                    break
-            else:
-                # "Paint" it to the map's tiles
-                self.create_room(new_room)
-
-                # Center coordinates of new room, will be useful later
-                (new_x, new_y) = new_room.center()
-
-                center_of_last_room_x = new_x
-                center_of_last_room_y = new_y
-
-                if num_rooms == 0:
-                    # This is the first room, where the player starts at
-                    player.x = new_x
-                    player.y = new_y
-                else:
-                    # All rooms after the first:
-                    # Connect it to the previous room with a tunnel
-
-                    # Center coordinates of previous room
-                    (prev_x, prev_y) = rooms[num_rooms - 1].center()
-
-                    if randint(0, 1) == 1:
-                        # First move horizontally, then vertically
-                        self.create_h_tunnel(prev_x, new_x, prev_y)
-                        self.create_v_tunnel(prev_y, new_y, new_x)
-                    else:
-                        # First move vertically, then horizontally
-                        self.create_v_tunnel(prev_y, new_y, prev_x)
-                        self.create_h_tunnel(prev_x, new_x, new_y)
-
-                self.place_entities(new_room, entities)
-
-                # Finally, append the new room to the list
-                rooms.append(new_room)
-                num_rooms += 1
-
-        # Once the last room has been created, put stairs in it leading down.
-        stairs_component = Stairs(self.dungeon_level + 1)
-        down_stairs = Entity(center_of_last_room_x, center_of_last_room_y, '>', libtcod.white, 'Stairs',
-                             render_order=RenderOrder.STAIRS, stairs=stairs_component)
-        entities.append(down_stairs)
-
-    def create_room(self, room):
-        """Goes through the tiles in the rectangle and makes them passable.
-
-        Args:
-            room(Rect): A Rect object representing the room.
-        """
-
-        for x in range(room.x1 + 1, room.x2):
-            for y in range(room.y1 + 1, room.y2):
-                self.tiles[x][y].blocked = False
-                self.tiles[x][y].block_sight = False
-
-    def create_h_tunnel(self, x1, x2, y):
-        """Creates a horizontal tunnel.
-
-        Args:
-            x1(int): The starting point.
-            x2(int): The end point.
-            y(int): Which row to use.
-        """
-
-        for x in range(min(x1, x2), max(x1, x2) + 1):
-            self.tiles[x][y].blocked = False
-            self.tiles[x][y].block_sight = False
-
-    def create_v_tunnel(self, y1, y2, x):
-        """Creates a vertical tunnel.
-
-        Args:
-            y1(int): The starting point.
-            y2(int): The end point.
-            x(int): Which column to use.
-        """
-
-        for y in range(min(y1, y2), max(y1, y2) + 1):
-            self.tiles[x][y].blocked = False
-            self.tiles[x][y].block_sight = False
-
-    def place_entities(self, room, entities):
-        """Gets a random number of monsters and items, and spawns them in the room.
-
-        First decides how many monsters and items can be in a room at once based
-        on dungeon level. Then chooses a random number of items and monsters to
-        spawn in this particular room. Iterates through the number of monsters
-        and randomly spawns monsters based on their chances to appear. Does the
-        same thing for items. Appends each spawned item to the entities list.
-
-        Args:
-            room(Rect): A Rect object that represents the room.
-            entities(list): A list of Entity objects.
-        """
-
-        max_monsters_per_room = from_dungeon_level([[2, 1], [3, 4], [5, 6]], self.dungeon_level)
-        max_items_per_room = from_dungeon_level([[1, 1], [2, 4]], self.dungeon_level)
-
-        number_of_monsters = randint(0, max_monsters_per_room)
-        number_of_items = randint(0, max_items_per_room)
-
-        monster_chances = {
-            'orc': 80,
-            'troll': from_dungeon_level([[15, 3], [30, 5], [60, 7]], self.dungeon_level)
-        }
-
-        item_chances = {
-            'healing_potion': 70,
-            'sword': from_dungeon_level([[5, 4]], self.dungeon_level),
-            'shield': from_dungeon_level([[15, 8]], self.dungeon_level),
-            'lightning_scroll': from_dungeon_level([[25, 4]], self.dungeon_level),
-            'fireball_scroll': from_dungeon_level([[25, 6]], self.dungeon_level),
-            'confusion_scroll': from_dungeon_level([[10, 2]], self.dungeon_level)
-        }
-
-        for i in range(number_of_monsters):
-            # Choose a random location in the room
-            x = randint(room.x1 + 1, room.x2 - 1)
-            y = randint(room.y1 + 1, room.y2 - 1)
-
-            # If nothing's there, create a monster.
-            if not any([entity for entity in entities if entity.x == x and entity.y == y]):
-                monster_choice = random_choice_from_dict(monster_chances)
-
-                if monster_choice == 'orc':
-                    fighter_component = Fighter(hp=20, defense=0, power=4, xp=35)
-                    ai_component = BasicMonster()
-
-                    monster = Entity(x, y, 'o', libtcod.desaturated_green, 'Orc', blocks=True,
-                                     render_order=RenderOrder.ACTOR, fighter=fighter_component, ai=ai_component)
-                elif monster_choice == 'troll':
-                    fighter_component = Fighter(hp=30, defense=2, power=8, xp=100)
-                    ai_component = BasicMonster()
-
-                    monster = Entity(x, y, 'T', libtcod.darker_green, 'Troll', blocks=True,
-                                     render_order=RenderOrder.ACTOR, fighter=fighter_component, ai=ai_component)
-
-                entities.append(monster)
-
-        for i in range(number_of_items):
-            # Choose a random location in the room
-            x = randint(room.x1 + 1, room.x2 - 1)
-            y = randint(room.y1 + 1, room.y2 - 1)
-
-            if not any([entity for entity in entities if entity.x == x and entity.y == y]):
-                item_choice = random_choice_from_dict(item_chances)
-
-                if item_choice == 'healing_potion':
-                    item_component = Item(use_function=heal, amount=40)
-                    item = Entity(x, y, '!', libtcod.violet, 'Healing Potion', render_order=RenderOrder.ITEM,
-                                  item=item_component)
-                elif item_choice == 'sword':
-                    equippable_component = Equippable(EquipmentSlots.MAIN_HAND, power_bonus=3)
-                    item = Entity(x, y, '/', libtcod.sky, 'Sword', equippable=equippable_component)
-
-                elif item_choice == 'shield':
-                    equippable_component = Equippable(EquipmentSlots.OFF_HAND, defense_bonus=1)
-                    item = Entity(x, y, '[', libtcod.darker_orange, 'Shield', equippable=equippable_component)
-
-                elif item_choice == 'fireball_scroll':
-                    item_component = Item(use_function=cast_fireball, targeting=True, targeting_message=Message(
-                        'Left-click a target tile for the fireball, or right-click to cancel.', libtcod.light_cyan),
-                                          damage=25, radius=3)
-                    item = Entity(x, y, '#', libtcod.red, 'Fireball Scroll', render_order=RenderOrder.ITEM,
-                                  item=item_component)
-                elif item_choice == 'confusion_scroll':
-                    item_component = Item(use_function=cast_confuse, targeting=True, targeting_message=Message(
-                        'Left-click an enemy to confuse it, or right-click to cancel.', libtcod.light_cyan))
-                    item = Entity(x, y, '#', libtcod.light_pink, 'Confusion Scroll', render_order=RenderOrder.ITEM,
-                                  item=item_component)
-                elif item_choice == 'lightning_scroll':
-                    item_component = Item(use_function=cast_lightning, damage=40, maximum_range=5)
-                    item = Entity(x, y, '#', libtcod.yellow, 'Lightning Scroll', render_order=RenderOrder.ITEM,
-                                  item=item_component)
-
-                entities.append(item)
-
-    def is_blocked(self, x, y):
-        """Returns boolean about whether a tile is blocked.
-
-        Args:
-            x(int): The tile's x coordinate.
-            y(int): The tile's y coordinate.
-
-        Returns:
-            (bool): A boolean value describing whether the tile
-                specified in this object's 2D tile array
-                blocks movement.
-        """
-
-        if self.tiles[x][y].blocked:
-            return True
-
-        return False
-
-    def next_floor(self, player, message_log, constants):
-        """Moves the player down one floor of the dungeon.
-
-        Increases dungeon level by one, clears the entities
-        list except for the player, and creates a new map.
-        Also heals the player for half their max HP.
-
-        Args:
-            player(Entity): Entity object representing the player.
-            message_log(MessageLog): MessageLog object containing game messages.
-            constants(dict): Dictionary containing game's constant variables.
-
-        Returns:
-            entities(list): New entities list containing only the player.
-        """
-
-        self.dungeon_level += 1
-        entities = [player]
-
-        self.tiles = self.initialize_tiles()
-        self.make_map(constants['max_rooms'], constants['room_min_size'], constants['room_max_size'],
-                      constants['map_width'], constants['map_height'], player, entities)
-
-        player.fighter.heal(player.fighter.max_hp // 2)  # '//' is integer division (e.g. 5 // 2 = 2, 5 / 2 = 2.5)
-
-        message_log.add_message(Message('You take a moment to rest and recover your strength.', libtcod.light_violet))
-
-        return entities
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import copy
+import numpy as np
+import tcod as libtcod
+
+from project.entity import Entity
+from project.game_messages import Message
+from project.render_functions import RenderOrder
+from project.item_functions import heal, cast_lightning, cast_fireball, cast_confuse
+from project.random_utils import GameRNG, random_choice_indices, from_dungeon_level
+
+from project.components.ai import BasicMonster
+from project.components.fighter import Fighter
+from project.components.item import Item
+from project.components.stairs import Stairs
+from project.components.equipment import EquipmentSlots
+from project.components.equippable import Equippable
+
+from project.map_objects.tile import new_tiles
+from project.map_objects.rectangle import Rect
+from project.map_objects.room_index import RoomIndex
+from project.map_objects.entity_index import EntityIndex
+from project.map_objects.actor_set import ActorSet
+from project.map_objects.navigation import NavigationGrid
+from project.map_objects.room_graph import RoomGraph
+
+
+class GameMap:
+    """GameMap handles the creation of a random map by creating rooms, tunnels, and placing entities."""
+
+    def __init__(self, width, height, dungeon_level=1, seed=None):
+        """Inits values for the game map.
+
+        Args:
+            width(int): An integer defining the width of the map.
+            height(int): An integer defining the height of the map.
+            dungeon_level(int): The current dungeon level.
+            seed(int): The game's master seed. Every floor is generated from this
+                seed and its dungeon level. If it isn't set, a random one is picked.
+        """
+
+        self.width = width
+        self.height = height
+        self.tiles = self.initialize_tiles()
+
+        # Which tiles the player has seen, indexed [x, y] like the tiles.
+        self.explored = np.zeros((width, height), dtype=np.bool_)
+
+        # Bounding box (x1, y1, x2, y2) of the tiles in the player's FOV, ends exclusive, or None.
+        self.visible_area = None
+
+        # Bumped whenever the tiles change, so caches built from them know when they're stale.
+        self.version = 0
+
+        # Where every entity on the floor is, kept up to date by Entity.move.
+        self.entity_index = EntityIndex()
+
+        # The monsters that can act, split into awake and dormant.
+        self.actors = ActorSet()
+
+        # Movement costs shared by every monster's pathfinding during a turn.
+        self.navigation = NavigationGrid(self)
+
+        # Rooms from the last call to make_map, kept for later queries.
+        self.room_index = RoomIndex()
+        self.rooms = self.room_index.rooms
+
+        # Which rooms connect to which, for planning long routes.
+        self.room_graph = RoomGraph(width, height)
+
+        self.dungeon_level = dungeon_level
+
+        # All the game's randomness comes from streams of this one RNG.
+        self.rng = GameRNG(seed)
+        self.seed = self.rng.seed
+
+    def __getstate__(self):
+        """Returns the state to pickle, with the explored array packed into bits."""
+
+        state = self.__dict__.copy()
+        state['explored'] = np.packbits(self.explored, axis=None)
+
+        return state
+
+    def __setstate__(self, state):
+        """Restores a pickled map, unpacking the explored array and binding the navigation grid to it again."""
+
+        packed = state['explored']
+        state['explored'] = np.unpackbits(packed, count=state['width'] * state['height']).astype(np.bool_).reshape(
+            state['width'], state['height'])
+
+        self.__dict__.update(state)
+
+        self.navigation.game_map = self
+
+    def update_explored(self, fov_map):
+        """Marks every tile in the player's FOV as explored, and notes the box around the FOV in visible_area.
+
+        Called once after each FOV computation; it's a single OR over
+        the whole map rather than a write per visible tile.
+
+        Args:
+            fov_map(Map): The tcod Map holding the player's FOV, indexed [y, x].
+        """
+
+        # tcod's fov array is a strided view into its map cells, so copy it once.
+        visible = np.ascontiguousarray(fov_map.fov)
+
+        self.explored |= visible.T
+
+        rows = np.flatnonzero(visible.any(axis=1))
+        self.visible_area = None
+
+        if rows.size:
+            columns = np.flatnonzero(visible[rows[0]:rows[-1] + 1].any(axis=0))
+            self.visible_area = (int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1)
+
+    def initialize_tiles(self):
+        """Creates a 2D array of tiles with own width and height.
+
+        By default every tile blocks movement, since a different function
+        (make_map) is responsible for "digging out" the rooms and tunnels.
+
+        The tiles are one structured NumPy array indexed as tiles[x, y].
+        Whole-map views like tiles['blocked'] can be read without loops,
+        and tiles[x][y].blocked still works for single tiles.
+
+        Returns:
+            tiles(np.recarray): A 2D array of tiles with the dimensions of the GameMap object.
+        """
+
+        tiles = new_tiles(self.width, self.height)
+
+        return tiles
+
+    def make_map(self, max_rooms, room_min_size, room_max_size, map_width, map_height, player, entities, rng=None):
+        """Creates a a random map and populates it with monsters and the player.
+
+        Starts by creating a random room somewhere in the map,
+        plopping the player in the center of it, then creating
+        new rooms, connecting them with tunnels, and spawning
+        monsters in them. Accepted rooms are kept in self.rooms,
+        and a RoomIndex is used to check new rooms for overlaps.
+        The rooms and the corridors joining them are recorded in
+        self.room_graph.
+
+        Args:
+            max_rooms(int): Max amount of rooms in this map.
+            room_min_size(int): How small a room can be.
+            room_max_size(int): How big a room can be.
+            map_width(int): Width of the map.
+            map_height(int): Height of a map.
+            player(Entity): The player's Entity object.
+            entities(list): A list containing all the objects on the map.
+            rng(GameRNG): Where to get this floor's 'map' and 'spawn' streams.
+                Defaults to self.rng. The streams only depend on the master
+                seed and the dungeon level, so the same floor comes out no
+                matter when or on which thread it's generated.
+        """
+
+        if rng is None:
+            rng = self.rng
+
+        spawn_rng = rng.floor_stream('spawn', self.dungeon_level)
+        rng = rng.floor_stream('map', self.dungeon_level)
+
+        self.entity_index = EntityIndex(entities)
+        self.actors = ActorSet(entities)
+        self.room_index = RoomIndex(bucket_size=room_max_size)
+        self.rooms = rooms = self.room_index.rooms
+        self.room_graph = RoomGraph(self.width, self.height)
+        num_rooms = 0
+
+        center_of_last_room_x = None
+        center_of_last_room_y = None
+
+        for r in range(max_rooms):
+            # Random width and height
+            w = rng.randint(room_min_size, room_max_size)
+            h = rng.randint(room_min_size, room_max_size)
+            # Random position without going out of the boundaries of the map
+            x = rng.randint(0, map_width - w - 1)
+            y = rng.randint(0, map_height - h - 1)
+
+            # "Rect" class makes rectangles easier to work with
+            new_room = Rect(x, y, w, h)
+
+            # Ask the index if any of the other rooms intersect with this one
+            if not self.room_index.intersects(new_room):
+                # "Paint" it to the map's tiles
+                self.create_room(new_room)
+                self.room_graph.add_room(new_room)
+
+                # Center coordinates of new room, will be useful later
+                (new_x, new_y) = new_room.center()
+
+                center_of_last_room_x = new_x
+                center_of_last_room_y = new_y
+
+                if num_rooms == 0:
+                    # This is the first room, where the player starts at
+                    player.move(new_x - player.x, new_y - player.y)
+                else:
+                    # All rooms after the first:
+                    # Connect it to the previous room with a tunnel
+
+                    # Center coordinates of previous room
+                    (prev_x, prev_y) = rooms[num_rooms - 1].center()
+
+                    # Randomly choose whether to move horizontally or vertically first
+                    horizontal_first = rng.randint(0, 1) == 1
+                    self.carve_corridor(prev_x, prev_y, new_x, new_y, horizontal_first=horizontal_first)
+                    self.room_graph.add_corridor(prev_x, prev_y, new_x, new_y, horizontal_first)
+
+                self.place_entities(new_room, entities, spawn_rng)
+
+                # Finally, add the new room to the index (which also appends it to the list)
+                self.room_index.add(new_room)
+                num_rooms += 1
+
+        # Once the last room has been created, put stairs in it leading down.
+        stairs_component = Stairs(self.dungeon_level + 1)
+        down_stairs = Entity(center_of_last_room_x, center_of_last_room_y, '>', libtcod.white, 'Stairs',
+                             render_order=RenderOrder.STAIRS, stairs=stairs_component)
+        entities.append(down_stairs)
+        self.entity_index.add(down_stairs)
+
+    def carve_rect(self, x1, y1, x2, y2):
+        """Makes every tile in a rectangle passable and see-through.
+
+        Uses slice assignment over the tile arrays, so the cost doesn't
+        depend on the area of the rectangle in Python terms. Like slices,
+        the top left corner is inclusive and the bottom right is exclusive.
+
+        Args:
+            x1(int): x coordinate of the top left corner.
+            y1(int): y coordinate of the top left corner.
+            x2(int): x coordinate of the bottom right corner.
+            y2(int): y coordinate of the bottom right corner.
+        """
+
+        self.tiles['blocked'][x1:x2, y1:y2] = False
+        self.tiles['block_sight'][x1:x2, y1:y2] = False
+        self.version += 1
+
+    def carve_mask(self, mask):
+        """Makes every tile selected by a boolean mask passable and see-through.
+
+        Args:
+            mask(np.ndarray): A (width, height) boolean array, or anything
+                else NumPy accepts as an index into the tile arrays.
+        """
+
+        self.tiles['blocked'][mask] = False
+        self.tiles['block_sight'][mask] = False
+        self.version += 1
+
+    def carve_corridor(self, x1, y1, x2, y2, horizontal_first=True):
+        """Digs an L-shaped corridor between two points.
+
+        Args:
+            x1(int): x coordinate of the starting point.
+            y1(int): y coordinate of the starting point.
+            x2(int): x coordinate of the end point.
+            y2(int): y coordinate of the end point.
+            horizontal_first(bool): If True, move horizontally first and
+                then vertically. Otherwise, move vertically first.
+        """
+
+        if horizontal_first:
+            self.create_h_tunnel(x1, x2, y1)
+            self.create_v_tunnel(y1, y2, x2)
+        else:
+            self.create_v_tunnel(y1, y2, x1)
+            self.create_h_tunnel(x1, x2, y2)
+
+    def create_room(self, room):
+        """Makes the tiles inside the rectangle passable.
+
+        Args:
+            room(Rect): A Rect object representing the room.
+        """
+
+        self.carve_rect(room.x1 + 1, room.y1 + 1, room.x2, room.y2)
+
+    def create_h_tunnel(self, x1, x2, y):
+        """Creates a horizontal tunnel.
+
+        Args:
+            x1(int): The starting point.
+            x2(int): The end point.
+            y(int): Which row to use.
+        """
+
+        self.carve_rect(min(x1, x2), y, max(x1, x2) + 1, y + 1)
+
+    def create_v_tunnel(self, y1, y2, x):
+        """Creates a vertical tunnel.
+
+        Args:
+            y1(int): The starting point.
+            y2(int): The end point.
+            x(int): Which column to use.
+        """
+
+        self.carve_rect(x, min(y1, y2), x + 1, max(y1, y2) + 1)
+
+    def place_entities(self, room, entities, rng=None):
+        """Gets a random number of monsters and items, and spawns them in the room.
+
+        First decides how many monsters and items can be in a room at once based
+        on dungeon level. Then chooses a random number of items and monsters to
+        spawn in this particular room. Iterates through the number of monsters
+        and randomly spawns monsters based on their chances to appear. Does the
+        same thing for items. Appends each spawned item to the entities list,
+        and adds it to the entity index, which is also used to check that
+        nothing's already standing where something spawns.
+
+        Args:
+            room(Rect): A Rect object that represents the room.
+            entities(list): A list of Entity objects.
+            rng(RandomStream): Random stream to draw from. Defaults to this
+                floor's 'spawn' stream.
+        """
+
+        if rng is None:
+            rng = self.rng.floor_stream('spawn', self.dungeon_level)
+
+        max_monsters_per_room = from_dungeon_level([[2, 1], [3, 4], [5, 6]], self.dungeon_level)
+        max_items_per_room = from_dungeon_level([[1, 1], [2, 4]], self.dungeon_level)
+
+        number_of_monsters = rng.randint(0, max_monsters_per_room)
+        number_of_items = rng.randint(0, max_items_per_room)
+
+        monster_chances = {
+            'orc': 80,
+            'troll': from_dungeon_level([[15, 3], [30, 5], [60, 7]], self.dungeon_level)
+        }
+
+        item_chances = {
+            'healing_potion': 70,
+            'sword': from_dungeon_level([[5, 4]], self.dungeon_level),
+            'shield': from_dungeon_level([[15, 8]], self.dungeon_level),
+            'lightning_scroll': from_dungeon_level([[25, 4]], self.dungeon_level),
+            'fireball_scroll': from_dungeon_level([[25, 6]], self.dungeon_level),
+            'confusion_scroll': from_dungeon_level([[10, 2]], self.dungeon_level)
+        }
+
+        # Draw every location and choice for the room in batches,
+        # rather than a few single draws per monster and item.
+        locations = rng.randint_array((room.x1 + 1, room.y1 + 1), (room.x2 - 1, room.y2 - 1),
+                                      (number_of_monsters + number_of_items, 2)).tolist()
+
+        monster_names = list(monster_chances.keys())
+        monster_choices = random_choice_indices(monster_chances.values(), number_of_monsters, rng).tolist()
+
+        item_names = list(item_chances.keys())
+        item_choices = random_choice_indices(item_chances.values(), number_of_items, rng).tolist()
+
+        for (x, y), choice in zip(locations[:number_of_monsters], monster_choices):
+            # If nothing's there, create a monster.
+            if not self.entity_index.entities_at(x, y):
+                monster_choice = monster_names[choice]
+
+                if monster_choice == 'orc':
+                    fighter_component = Fighter(hp=20, defense=0, power=4, xp=35)
+                    ai_component = BasicMonster()
+
+                    monster = Entity(x, y, 'o', libtcod.desaturated_green, 'Orc', blocks=True,
+                                     render_order=RenderOrder.ACTOR, fighter=fighter_component, ai=ai_component)
+                elif monster_choice == 'troll':
+                    fighter_component = Fighter(hp=30, defense=2, power=8, xp=100)
+                    ai_component = BasicMonster()
+
+                    monster = Entity(x, y, 'T', libtcod.darker_green, 'Troll', blocks=True,
+                                     render_order=RenderOrder.ACTOR, fighter=fighter_component, ai=ai_component)
+
+                entities.append(monster)
+                self.entity_index.add(monster)
+                self.actors.add(monster)
+
+        for (x, y), choice in zip(locations[number_of_monsters:], item_choices):
+            if not self.entity_index.entities_at(x, y):
+                item_choice = item_names[choice]
+
+                if item_choice == 'healing_potion':
+                    item_component = Item(use_function=heal, amount=40)
+                    item = Entity(x, y, '!', libtcod.violet, 'Healing Potion', render_order=RenderOrder.ITEM,
+                                  item=item_component)
+                elif item_choice == 'sword':
+                    equippable_component = Equippable(EquipmentSlots.MAIN_HAND, power_bonus=3)
+                    item = Entity(x, y, '/', libtcod.sky, 'Sword', equippable=equippable_component)
+
+                elif item_choice == 'shield':
+                    equippable_component = Equippable(EquipmentSlots.OFF_HAND, defense_bonus=1)
+                    item = Entity(x, y, '[', libtcod.darker_orange, 'Shield', equippable=equippable_component)
+
+                elif item_choice == 'fireball_scroll':
+                    item_component = Item(use_function=cast_fireball, targeting=True, targeting_message=Message(
+                        'Left-click a target tile for the fireball, or right-click to cancel.', libtcod.light_cyan),
+                                          damage=25, radius=3)
+                    item = Entity(x, y, '#', libtcod.red, 'Fireball Scroll', render_order=RenderOrder.ITEM,
+                                  item=item_component)
+                elif item_choice == 'confusion_scroll':
+                    item_component = Item(use_function=cast_confuse, targeting=True, targeting_message=Message(
+                        'Left-click an enemy to confuse it, or right-click to cancel.', libtcod.light_cyan))
+                    item = Entity(x, y, '#', libtcod.light_pink, 'Confusion Scroll', render_order=RenderOrder.ITEM,
+                                  item=item_component)
+                elif item_choice == 'lightning_scroll':
+                    item_component = Item(use_function=cast_lightning, damage=40, maximum_range=5)
+                    item = Entity(x, y, '#', libtcod.yellow, 'Lightning Scroll', render_order=RenderOrder.ITEM,
+                                  item=item_component)
+
+                entities.append(item)
+                self.entity_index.add(item)
+
+    def is_blocked(self, x, y):
+        """Returns boolean about whether a tile is blocked.
+
+        Args:
+            x(int): The tile's x coordinate.
+            y(int): The tile's y coordinate.
+
+        Returns:
+            (bool): A boolean value describing whether the tile
+                specified in this object's 2D tile array
+                blocks movement.
+        """
+
+        return bool(self.tiles['blocked'][x, y])
+
+    def load_floor(self, floor_map, floor_entities, player):
+        """Swaps in a floor made by generate_floor.
+
+        Takes over the generated map's tiles, rooms, room graph and actors,
+        and moves the player to where the stand-in player was placed.
+
+        Args:
+            floor_map(GameMap): The generated map.
+            floor_entities(list): The generated entities, with the stand-in player first.
+            player(Entity): Entity object representing the player.
+
+        Returns:
+            entities(list): The floor's entities, with the real player first.
+        """
+
+        self.tiles = floor_map.tiles
+        self.explored = floor_map.explored
+        self.visible_area = None
+        self.version += 1
+        self.entity_index = floor_map.entity_index
+        self.actors = floor_map.actors
+        self.room_index = floor_map.room_index
+        self.rooms = floor_map.rooms
+        self.room_graph = floor_map.room_graph
+        self.dungeon_level = floor_map.dungeon_level
+
+        start = floor_entities[0]
+        self.entity_index.remove(start)
+        player.x = start.x
+        player.y = start.y
+        self.entity_index.add(player)
+
+        return [player] + floor_entities[1:]
+
+    def snapshot_floor(self, player, entities):
+        """Packs up the current floor in the same form generate_floor returns.
+
+        The tile arrays aren't copied; they're replaced rather than changed
+        when the player leaves the floor, so sharing them is safe. The copy
+        gets its own entity index, actor set and navigation grid, so this
+        map's are left alone and storing the copy doesn't drag this map
+        along. The floor's entities are handed over to the copy's index, so
+        only take a snapshot of a floor that's being left.
+
+        Args:
+            player(Entity): Entity object representing the player.
+            entities(list): The current floor's entities.
+
+        Returns:
+            floor_map(GameMap): A shallow copy of this map.
+            floor_entities(list): The floor's entities, with a stand-in for the player first.
+        """
+
+        floor_map = copy.copy(self)
+        start = _stand_in_player(player.x, player.y)
+        floor_entities = [start] + [entity for entity in entities if entity != player]
+
+        floor_map.entity_index = EntityIndex(floor_entities)
+        floor_map.navigation = NavigationGrid(floor_map)
+
+        # Same turn order, and whoever was awake stays awake.
+        floor_map.actors = ActorSet()
+        for entity in self.actors.order:
+            floor_map.actors.add(entity, awake=entity in self.actors.awake)
+
+        return floor_map, floor_entities
+
+    def change_floor(self, dungeon_level, player, entities, constants, pregenerator=None, floor_store=None):
+        """Leaves the current floor for another one.
+
+        If a FloorStore is passed, the current floor is stored in it, and
+        the new floor is taken from it if the player has been there before.
+        Otherwise, if a FloorPregenerator is passed and it has already
+        started on the new floor, its result is swapped in. If neither has
+        the floor, it's generated here. All of these give the same floor.
+
+        Args:
+            dungeon_level(int): Which floor to go to.
+            player(Entity): Entity object representing the player.
+            entities(list): The current floor's entities.
+            constants(dict): Dictionary containing game's constant variables.
+            pregenerator(FloorPregenerator): Optional background floor generator.
+            floor_store(FloorStore): Optional store of previously visited floors.
+
+        Returns:
+            entities(list): New entities list containing the player and the new floor's entities.
+        """
+
+        floor = None
+
+        if floor_store is not None:
+            floor_store.put(self.dungeon_level, *self.snapshot_floor(player, entities))
+            floor = floor_store.take(dungeon_level)
+
+        if floor is None and pregenerator:
+            floor = pregenerator.take(self.seed, dungeon_level)
+
+        if floor is None:
+            floor = generate_floor(self.seed, dungeon_level, constants)
+
+        return self.load_floor(*floor, player)
+
+    def next_floor(self, player, message_log, constants, pregenerator=None, floor_store=None, entities=None):
+        """Moves the player down one floor of the dungeon.
+
+        Increases dungeon level by one, clears the entities
+        list except for the player, and creates a new map.
+        Also heals the player for half their max HP.
+        See change_floor for how the new floor is found.
+
+        Args:
+            player(Entity): Entity object representing the player.
+            message_log(MessageLog): MessageLog object containing game messages.
+            constants(dict): Dictionary containing game's constant variables.
+            pregenerator(FloorPregenerator): Optional background floor generator.
+            floor_store(FloorStore): Optional store of previously visited floors.
+            entities(list): The current floor's entities. Only needed with a floor_store.
+
+        Returns:
+            entities(list): New entities list containing the player and the new floor's entities.
+        """
+
+        if entities is None:
+            entities = [player]
+
+        entities = self.change_floor(self.dungeon_level + 1, player, entities, constants, pregenerator, floor_store)
+
+        player.fighter.heal(player.fighter.max_hp // 2)  # '//' is integer division (e.g. 5 // 2 = 2, 5 / 2 = 2.5)
+
+        message_log.add_message(Message('You take a moment to rest and recover your strength.', libtcod.light_violet))
+
+        return entities
+
+
+def _stand_in_player(x=0, y=0):
+    """Returns a bare Entity that marks where the player is (or will be) on a floor that isn't loaded."""
+
+    return Entity(x, y, '@', libtcod.white, 'Player', blocks=True, render_order=RenderOrder.ACTOR)
+
+
+def generate_floor(seed, dungeon_level, constants):
+    """Generates one whole floor of the dungeon, without touching the current game.
+
+    A stand-in player Entity is used so make_map can pick the starting
+    position and keep monsters from spawning on it. The result only
+    depends on the arguments, so it's safe to call from a worker thread
+    or process.
+
+    Args:
+        seed(int): The game's master seed.
+        dungeon_level(int): Which floor to generate.
+        constants(dict): Dictionary containing game's constant variables.
+
+    Returns:
+        floor_map(GameMap): A new GameMap holding the floor's tiles and rooms.
+        floor_entities(list): The floor's entities, with the stand-in player first.
+    """
+
+    floor_map = GameMap(constants['map_width'], constants['map_height'], dungeon_level, seed=seed)
+
+    start = _stand_in_player()
+    floor_entities = [start]
+
+    floor_map.make_map(constants['max_rooms'], constants['room_min_size'], constants['room_max_size'],
+                       constants['map_width'], constants['map_height'], start, floor_entities)
+
+    return floor_map, floor_entities
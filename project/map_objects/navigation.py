@@ -0,0 +1,438 @@
+"""
+A navigation grid shared by every monster that paths towards something during a turn.
+
+Instead of every monster copying the whole map and overlaying every blocking entity on its own, the grid is built
+once per turn from the tile arrays plus an occupancy layer, and each path search only pays for the search itself.
+The grid can also hold a Dijkstra flow field: one distance map towards a single target (usually the player) that
+every chasing monster walks down, so a horde costs one map-wide search per turn rather than one search per monster.
+Long routes are planned a room or corridor at a time over the map's RoomGraph, and only refined with A* up to the
+next door. Monsters keep their last route in a PathCache, and only plan again once something it depends on changed.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import numpy as np
+import tcod
+
+
+class NavigationGrid:
+    """Per-turn movement costs for a GameMap, with a reusable A* pathfinder.
+
+    The cost array is indexed [x, y] like the tiles: 1 for walkable cells
+    and 0 for walls and cells occupied by blocking entities.
+
+    Attributes:
+        game_map(GameMap): The map the grid is built from.
+        walkable(np.ndarray): Cost of the bare map, rebuilt only when the map's version changes.
+        cost(np.ndarray): walkable plus the occupancy layer. Pathfinding reads this array.
+        map_version(int): The map version walkable was built from.
+        astar(tcod.path.AStar): Pathfinder bound to the cost array.
+        flow_target(tuple): The (x, y) the flow field leads to, or None when there's no flow field this turn.
+        distance(np.ndarray): The flow field, the walking distance from every cell to flow_target.
+        occupancy_stamps(np.ndarray): Bumped on every cell whose cost changes, so a cached path can tell if
+            anything along it did.
+        plans_computed(int): Routes planned since the last update.
+        plans_reused(int): Routes taken from a PathCache since the last update.
+        total_plans_computed(int): Routes planned since the grid was made.
+        total_plans_reused(int): Routes taken from a PathCache since the grid was made.
+    """
+
+    # Edge costs for the flow field. 2 and 3 keep diagonals at roughly the 1.41 A* uses.
+    CARDINAL_COST = 2
+    DIAGONAL_COST = 3
+    UNREACHABLE = np.iinfo(np.int32).max
+    NEIGHBOURS = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+    def __init__(self, game_map):
+        """Inits an empty grid. It's built the first time it's needed.
+
+        Args:
+            game_map(GameMap): The map the grid is built from.
+        """
+
+        self.game_map = game_map
+        self.walkable = None
+        self.cost = None
+        self.next_cost = None
+        self.occupancy_stamps = None
+        self.map_version = None
+        self.astar = None
+        self.flow_target = None
+        self.flow_key = None
+        self.distance = None
+        self.plans_computed = 0
+        self.plans_reused = 0
+        self.total_plans_computed = 0
+        self.total_plans_reused = 0
+
+    def __getstate__(self):
+        """Nothing is pickled; the arrays and pathfinder are rebuilt on demand.
+
+        The map reference is left out too, so pickling a grid never drags
+        a map along. The GameMap that owns the grid binds it again when
+        it's unpickled.
+        """
+
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__(None)
+
+    def update(self, flow_target=None):
+        """Rebuilds the grid for the current turn.
+
+        The walkable layer only gets rebuilt if the map's shape or version
+        changed. Then every blocking entity's cell is marked as blocked on
+        a copy of it, the cells that changed since last turn get their
+        occupancy stamps bumped, and the result is copied into the cost
+        array (in place, so the A* pathfinder stays bound to it). The
+        per-turn plan counters start over.
+
+        Args:
+            flow_target(Entity): If given, the flow field is brought up to
+                date towards this Entity. Otherwise monsters use A* this turn.
+        """
+
+        game_map = self.game_map
+        shape = (game_map.width, game_map.height)
+
+        if self.cost is None or self.cost.shape != shape:
+            self.walkable = np.zeros(shape, dtype=np.int8)
+            self.cost = np.zeros(shape, dtype=np.int8)
+            self.next_cost = np.zeros(shape, dtype=np.int8)
+            self.occupancy_stamps = np.zeros(shape, dtype=np.int64)
+            self.astar = tcod.path.AStar(self.cost, diagonal=1.41)
+            self.map_version = None
+
+        if self.map_version != game_map.version:
+            self.walkable[...] = ~game_map.tiles['blocked']
+            self.map_version = game_map.version
+
+        next_cost = self.next_cost
+        np.copyto(next_cost, self.walkable)
+
+        for (x, y), cell in game_map.entity_index.cells.items():
+            for entity in cell:
+                if entity.blocks:
+                    next_cost[x, y] = 0
+                    break
+
+        self.occupancy_stamps[next_cost != self.cost] += 1
+        np.copyto(self.cost, next_cost)
+
+        self.plans_computed = 0
+        self.plans_reused = 0
+
+        if flow_target:
+            self.update_flow_field(flow_target.x, flow_target.y)
+        else:
+            self.flow_target = None
+
+    def update_flow_field(self, goal_x, goal_y):
+        """Computes the distance from every cell to the goal.
+
+        Only walls count here, not entities, so the field stays valid while
+        monsters shuffle around; occupancy is handled when stepping. It's
+        only recomputed when the goal moves or the map changes.
+
+        Args:
+            goal_x(int): x coordinate the field leads to.
+            goal_y(int): y coordinate the field leads to.
+        """
+
+        if self.cost is None:
+            self.update()
+
+        key = (goal_x, goal_y, self.map_version)
+
+        if key != self.flow_key:
+            distance = np.full(self.walkable.shape, self.UNREACHABLE, dtype=np.int32)
+            distance[goal_x, goal_y] = 0
+            # Fills in distance in place.
+            tcod.path.dijkstra2d(distance, self.walkable, self.CARDINAL_COST, self.DIAGONAL_COST)
+
+            self.distance = distance
+            self.flow_key = key
+
+        self.flow_target = (goal_x, goal_y)
+
+    def flow_reaches(self, x, y):
+        """Returns True if the flow field leads from this cell to its target.
+
+        Args:
+            x(int): x coordinate to check.
+            y(int): y coordinate to check.
+        """
+
+        return self.flow_target is not None and self.distance[x, y] != self.UNREACHABLE
+
+    def flow_step(self, x, y):
+        """Returns the next cell down the flow field from (x, y).
+
+        Out of the neighbours closer to the target, the closest one that
+        isn't occupied wins. Neighbours are checked in a fixed order, so
+        ties are broken the same way every time.
+
+        Args:
+            x(int): x coordinate to step from.
+            y(int): y coordinate to step from.
+
+        Returns:
+            (tuple): The (x, y) to step to, or None if every way down is
+                blocked (or there's no way down at all).
+        """
+
+        distance = self.distance
+        cost = self.cost
+        width, height = distance.shape
+
+        best = None
+        best_distance = distance[x, y]
+
+        for dx, dy in self.NEIGHBOURS:
+            nx = x + dx
+            ny = y + dy
+
+            if 0 <= nx < width and 0 <= ny < height and distance[nx, ny] < best_distance and cost[nx, ny]:
+                best = (nx, ny)
+                best_distance = distance[nx, ny]
+
+        return best
+
+    def entity_moved(self, old_x, old_y, new_x, new_y):
+        """Keeps the occupancy layer right after a blocking entity moves during the turn.
+
+        Args:
+            old_x(int): x coordinate the entity moved from.
+            old_y(int): y coordinate the entity moved from.
+            new_x(int): x coordinate the entity moved to.
+            new_y(int): y coordinate the entity moved to.
+        """
+
+        if self.cost is None:
+            return
+
+        if not self.game_map.entity_index.get_blocking_entity_at(old_x, old_y):
+            self.cost[old_x, old_y] = self.walkable[old_x, old_y]
+
+        self.cost[new_x, new_y] = 0
+
+        self.occupancy_stamps[old_x, old_y] += 1
+        self.occupancy_stamps[new_x, new_y] += 1
+
+    def occupancy_version(self, path):
+        """Returns a number that changes whenever the occupancy of any cell on a path does.
+
+        Args:
+            path(list): (x, y) cells.
+
+        Returns:
+            (int): The sum of the cells' occupancy stamps. Stamps only go up, so the sum changes with any of them.
+        """
+
+        if not path:
+            return 0
+
+        xs, ys = zip(*path)
+
+        return int(self.occupancy_stamps[xs, ys].sum())
+
+    def get_path(self, start_x, start_y, goal_x, goal_y):
+        """Returns the A* path between two cells.
+
+        The start and goal cells are usually occupied (by the monster and
+        its target), so they're unblocked just for the search.
+
+        Args:
+            start_x(int): Starting x coordinate.
+            start_y(int): Starting y coordinate.
+            goal_x(int): Goal x coordinate.
+            goal_y(int): Goal y coordinate.
+
+        Returns:
+            (list): (x, y) steps to the goal, not including the start, or an
+                empty list if there's no path.
+        """
+
+        if self.cost is None:
+            self.update()
+
+        cost = self.cost
+        start_cost = cost[start_x, start_y]
+        goal_cost = cost[goal_x, goal_y]
+
+        cost[start_x, start_y] = 1
+        cost[goal_x, goal_y] = 1
+
+        path = self.astar.get_path(start_x, start_y, goal_x, goal_y)
+
+        cost[start_x, start_y] = start_cost
+        cost[goal_x, goal_y] = goal_cost
+
+        return path
+
+    def get_path_within(self, area, start_x, start_y, goal_x, goal_y):
+        """Returns the A* path between two cells, without leaving a rectangle.
+
+        Args:
+            area(tuple): The (x1, y1, x2, y2) rectangle to stay inside, x2 and y2 exclusive.
+            start_x(int): Starting x coordinate, inside the rectangle.
+            start_y(int): Starting y coordinate, inside the rectangle.
+            goal_x(int): Goal x coordinate, inside the rectangle.
+            goal_y(int): Goal y coordinate, inside the rectangle.
+
+        Returns:
+            (list): (x, y) steps to the goal, not including the start, or an
+                empty list if there's no path.
+        """
+
+        if self.cost is None:
+            self.update()
+
+        x1, y1, x2, y2 = area
+        cost = self.cost[x1:x2, y1:y2].copy()
+        cost[start_x - x1, start_y - y1] = 1
+        cost[goal_x - x1, goal_y - y1] = 1
+
+        path = tcod.path.AStar(cost, diagonal=1.41).get_path(start_x - x1, start_y - y1, goal_x - x1, goal_y - y1)
+
+        return [(x + x1, y + y1) for x, y in path]
+
+    def get_route(self, start_x, start_y, goal_x, goal_y, max_local_length=25):
+        """Returns the next few steps towards a goal, planning the trip a room or corridor at a time.
+
+        The route is planned over the map's room graph first. A* then
+        only finds the way across the room or corridor the start is in,
+        to the door into the next one (or to the goal, if it's in there
+        too), walking around anything in the way. If the way to the door
+        is blocked, e.g. by a monster in a corridor, there's no route.
+
+        If either cell isn't part of the room graph, this is a plain A*
+        search instead, and paths of max_local_length steps or more are
+        rejected so monsters don't go running around the map when a
+        corridor is blocked.
+
+        Args:
+            start_x(int): Starting x coordinate.
+            start_y(int): Starting y coordinate.
+            goal_x(int): Goal x coordinate.
+            goal_y(int): Goal y coordinate.
+            max_local_length(int): Longest path allowed without the room graph.
+
+        Returns:
+            (list): (x, y) steps towards the goal, not including the start,
+                or an empty list if there's no path.
+        """
+
+        room_graph = self.game_map.room_graph
+        plan = room_graph.plan(start_x, start_y, goal_x, goal_y)
+
+        if plan is None:
+            path = self.get_path(start_x, start_y, goal_x, goal_y)
+
+            if len(path) >= max_local_length:
+                return []
+
+            return path
+
+        area_id, doors = plan
+
+        if not doors:
+            return self.get_path_within(room_graph.areas[area_id], start_x, start_y, goal_x, goal_y)
+
+        (exit_x, exit_y), entry = doors[0]
+
+        if (start_x, start_y) == (exit_x, exit_y):
+            return [entry]
+
+        path = self.get_path_within(room_graph.areas[area_id], start_x, start_y, exit_x, exit_y)
+
+        if not path:
+            return []
+
+        return path + [entry]
+
+
+class PathCache:
+    """A monster's last route, reused until it's no longer good.
+
+    A route is reused while the map version, the target's cell, the
+    monster's cell (where the last step should have left it) and the
+    occupancy of every cell still ahead on it all stay the same.
+
+    Attributes:
+        path(list): The (x, y) steps still ahead.
+        key(tuple): (map version, target x, target y, start x, start y) the path was planned for.
+        occupancy(int): NavigationGrid.occupancy_version of the path when it was last checked.
+    """
+
+    def __init__(self):
+        """Inits an empty cache."""
+
+        self.path = []
+        self.key = None
+        self.occupancy = None
+
+    def __getstate__(self):
+        """The cached route isn't worth saving; it's planned again after loading."""
+
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def clear(self):
+        """Forgets the cached route."""
+
+        self.path = []
+        self.key = None
+        self.occupancy = None
+
+    def get_route(self, navigation, start_x, start_y, goal_x, goal_y, max_local_length=25):
+        """Returns the cached route if it's still good, otherwise plans a new one with NavigationGrid.get_route.
+
+        Args:
+            navigation(NavigationGrid): The grid to plan on.
+            start_x(int): Starting x coordinate.
+            start_y(int): Starting y coordinate.
+            goal_x(int): Goal x coordinate.
+            goal_y(int): Goal y coordinate.
+            max_local_length(int): Passed on to NavigationGrid.get_route.
+
+        Returns:
+            (list): (x, y) steps towards the goal, not including the start,
+                or an empty list if there's no path.
+        """
+
+        if navigation.cost is None:
+            navigation.update()
+
+        key = (navigation.map_version, goal_x, goal_y, start_x, start_y)
+
+        if self.path and key == self.key and navigation.occupancy_version(self.path) == self.occupancy:
+            navigation.plans_reused += 1
+            navigation.total_plans_reused += 1
+
+            return self.path
+
+        navigation.plans_computed += 1
+        navigation.total_plans_computed += 1
+
+        self.path = navigation.get_route(start_x, start_y, goal_x, goal_y, max_local_length)
+        self.key = key
+        self.occupancy = navigation.occupancy_version(self.path)
+
+        return self.path
+
+    def advance(self, navigation):
+        """Moves the cache along after the monster took the first step of its route.
+
+        Args:
+            navigation(NavigationGrid): The grid the route was planned on.
+        """
+
+        (x, y), self.path = self.path[0], self.path[1:]
+
+        map_version, goal_x, goal_y, _, _ = self.key
+        self.key = (map_version, goal_x, goal_y, x, y)
+        self.occupancy = navigation.occupancy_version(self.path)
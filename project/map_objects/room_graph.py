@@ -0,0 +1,247 @@
+"""
+The connectivity graph of a floor's rooms and corridors, for planning long routes an area at a time.
+
+Every rectangle make_map carves out (a room, or one leg of a corridor) is an area, a node of the graph. Each carved
+cell is labelled with the last area that carved it, and areas whose labelled cells touch are neighbours, joined by a
+door where they touch. An area's whole rectangle is carved out, so walking between any two cells inside it takes exactly
+as many moves as the larger of the x and y differences.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import heapq
+
+import numpy as np
+
+
+class RoomGraph:
+    """Rooms and the corridors between them, as a graph.
+
+    Attributes:
+        regions(np.ndarray): The area each cell belongs to, indexed [x, y]. -1 for cells no area claims.
+        areas(list): The (x1, y1, x2, y2) rectangle of every area, by area id. x2 and y2 are exclusive.
+        neighbours(dict): Maps an area id to a dict of {neighbouring area id: door}. A door is a pair of touching
+            cells, ((x, y) inside this area, (x, y) inside the neighbour). Built from regions the first time it's needed.
+        bounds(np.ndarray): The areas as an (n, 4) array, for finding every area containing a cell.
+    """
+
+    NO_AREA = -1
+
+    def __init__(self, width, height):
+        """Inits an empty graph.
+
+        Args:
+            width(int): Width of the map.
+            height(int): Height of the map.
+        """
+
+        self.regions = np.full((width, height), self.NO_AREA, dtype=np.int32)
+        self.areas = []
+        self.neighbours = None
+        self.bounds = None
+
+    def __len__(self):
+        return len(self.areas)
+
+    def add_area(self, x1, y1, x2, y2):
+        """Adds a carved rectangle, with the same arguments as GameMap.carve_rect.
+
+        Args:
+            x1(int): Left edge, inclusive.
+            y1(int): Top edge, inclusive.
+            x2(int): Right edge, exclusive.
+            y2(int): Bottom edge, exclusive.
+
+        Returns:
+            (int): The new area's id.
+        """
+
+        area_id = len(self.areas)
+        self.areas.append((x1, y1, x2, y2))
+        self.regions[x1:x2, y1:y2] = area_id
+        self.neighbours = None
+
+        return area_id
+
+    def add_room(self, room):
+        """Adds the area create_room carves out for a room.
+
+        Args:
+            room(Rect): The room to add.
+
+        Returns:
+            (int): The room's area id.
+        """
+
+        return self.add_area(room.x1 + 1, room.y1 + 1, room.x2, room.y2)
+
+    def add_corridor(self, x1, y1, x2, y2, horizontal_first):
+        """Adds the two areas carve_corridor digs for an L-shaped corridor.
+
+        Takes the same arguments as GameMap.carve_corridor.
+
+        Args:
+            x1(int): x coordinate of the starting point.
+            y1(int): y coordinate of the starting point.
+            x2(int): x coordinate of the end point.
+            y2(int): y coordinate of the end point.
+            horizontal_first(bool): Was the corridor dug horizontally first?
+        """
+
+        if horizontal_first:
+            self.add_area(min(x1, x2), y1, max(x1, x2) + 1, y1 + 1)
+            self.add_area(x2, min(y1, y2), x2 + 1, max(y1, y2) + 1)
+        else:
+            self.add_area(x1, min(y1, y2), x1 + 1, max(y1, y2) + 1)
+            self.add_area(min(x1, x2), y2, max(x1, x2) + 1, y2 + 1)
+
+    def build(self):
+        """Works out which areas touch, and where, from the labelled cells.
+
+        Every cell is compared with its right, lower and diagonal
+        neighbours in one pass over the whole array per direction. For
+        each pair of touching areas one pair of touching cells is kept as
+        the door between them.
+        """
+
+        regions = self.regions
+        width, height = regions.shape
+        doors = []
+
+        for dx, dy in ((1, 0), (0, 1), (1, 1), (1, -1)):
+            # a is every cell that has a neighbour in this direction, b is that neighbour
+            a_x = slice(0, width - dx)
+            a_y = slice(max(-dy, 0), height - max(dy, 0))
+            b_x = slice(dx, width)
+            b_y = slice(max(dy, 0), height + min(dy, 0))
+
+            a = regions[a_x, a_y]
+            b = regions[b_x, b_y]
+            touching = (a != b) & (a != self.NO_AREA) & (b != self.NO_AREA)
+
+            xs, ys = np.nonzero(touching)
+            xs = xs + a_x.start
+            ys = ys + a_y.start
+            a_areas = a[touching]
+            b_areas = b[touching]
+
+            # The door works both ways: (from area, to area, exit x, exit y, entry x, entry y)
+            doors.append(np.stack((a_areas, b_areas, xs, ys, xs + dx, ys + dy), axis=-1))
+            doors.append(np.stack((b_areas, a_areas, xs + dx, ys + dy, xs, ys), axis=-1))
+
+        doors = np.concatenate(doors)
+        _, first = np.unique(doors[:, :2], axis=0, return_index=True)
+
+        self.neighbours = {area_id: {} for area_id in range(len(self.areas))}
+
+        for from_area, to_area, exit_x, exit_y, entry_x, entry_y in doors[first].tolist():
+            self.neighbours[from_area][to_area] = ((exit_x, exit_y), (entry_x, entry_y))
+
+        self.bounds = np.array(self.areas, dtype=np.int32).reshape(-1, 4)
+
+    def area_at(self, x, y):
+        """Returns the id of the area a cell is labelled with, or None if no area claims it.
+
+        Args:
+            x(int): x coordinate.
+            y(int): y coordinate.
+        """
+
+        area_id = int(self.regions[x, y])
+
+        return None if area_id == self.NO_AREA else area_id
+
+    def areas_at(self, x, y):
+        """Returns the ids of every area whose rectangle contains a cell.
+
+        Areas overlap where corridors cross rooms and each other, and
+        every one of them is a way out of the cell.
+
+        Args:
+            x(int): x coordinate.
+            y(int): y coordinate.
+
+        Returns:
+            (list): Area ids, in the order they were added.
+        """
+
+        if self.neighbours is None:
+            self.build()
+
+        x1, y1, x2, y2 = self.bounds.T
+
+        return np.flatnonzero((x1 <= x) & (x < x2) & (y1 <= y) & (y < y2)).tolist()
+
+    def plan(self, start_x, start_y, goal_x, goal_y):
+        """Finds the shortest chain of areas between two cells.
+
+        Distances are counted in moves, door to door. Inside an area that
+        is exact, since its whole rectangle is carved out. Every area
+        containing the start cell is a starting point, so after a step
+        along the plan, replanning costs at least one move less.
+
+        Args:
+            start_x(int): Starting x coordinate.
+            start_y(int): Starting y coordinate.
+            goal_x(int): Goal x coordinate.
+            goal_y(int): Goal y coordinate.
+
+        Returns:
+            (tuple): The area to move through first, and a list of
+                ((exit x, exit y), (entry x, entry y)) doors to go through
+                from there, one per area on the way. The list is empty if
+                the goal is inside the first area. None if either cell isn't
+                in an area or there's no way between them.
+        """
+
+        if self.area_at(start_x, start_y) is None or self.area_at(goal_x, goal_y) is None:
+            return None
+
+        came_from = {}
+        cost_so_far = {}
+        frontier = []
+
+        for area_id in self.areas_at(start_x, start_y):
+            came_from[area_id] = None
+            cost_so_far[area_id] = 0
+            frontier.append((0, area_id, (start_x, start_y)))
+
+        # The goal gets the id after the last area. It's reached from inside an area containing it
+        goal = len(self.areas)
+
+        while frontier:
+            cost, area_id, (x, y) = heapq.heappop(frontier)
+
+            if area_id == goal:
+                doors = []
+                area_id = came_from[goal]
+
+                while came_from[area_id] is not None:
+                    area_id, door = came_from[area_id]
+                    doors.append(door)
+
+                return area_id, doors[::-1]
+
+            if cost > cost_so_far[area_id]:
+                continue
+
+            x1, y1, x2, y2 = self.areas[area_id]
+
+            if x1 <= goal_x < x2 and y1 <= goal_y < y2:
+                new_cost = cost + max(abs(goal_x - x), abs(goal_y - y))
+
+                if new_cost < cost_so_far.get(goal, new_cost + 1):
+                    cost_so_far[goal] = new_cost
+                    came_from[goal] = area_id
+                    heapq.heappush(frontier, (new_cost, goal, (goal_x, goal_y)))
+
+            for neighbour, door in self.neighbours[area_id].items():
+                (exit_x, exit_y), entry = door
+                new_cost = cost + max(abs(exit_x - x), abs(exit_y - y)) + 1
+
+                if new_cost < cost_so_far.get(neighbour, new_cost + 1):
+                    cost_so_far[neighbour] = new_cost
+                    came_from[neighbour] = (area_id, door)
+                    heapq.heappush(frontier, (new_cost, neighbour, entry))
+
+        return None
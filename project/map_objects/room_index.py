@@ -0,0 +1,105 @@
+"""
+A bucketed spatial index for room rectangles.
+
+The map is split into square buckets, and every room is filed under each bucket it touches. Checking a candidate
+room against the index only compares it with the rooms filed under its own buckets, rather than every room on the map.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+
+class RoomIndex:
+    """Answers "does this rectangle overlap any room?" in near-constant time.
+
+    Attributes:
+        bucket_size(int): Width and height of each bucket in tiles.
+        rooms(list): Every Rect added to the index, in the order they were added.
+        buckets(dict): Maps (bucket_x, bucket_y) to a list of room indices.
+    """
+
+    def __init__(self, bucket_size=16):
+        """Inits an empty index.
+
+        A bucket size around the largest room size keeps each room in
+        at most four buckets.
+
+        Args:
+            bucket_size(int): Width and height of each bucket in tiles.
+        """
+
+        self.bucket_size = bucket_size
+        self.rooms = []
+        self.buckets = {}
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def __iter__(self):
+        return iter(self.rooms)
+
+    def _bucket_keys(self, rect):
+        """Yields the key of every bucket a rectangle touches, corners included."""
+
+        size = self.bucket_size
+
+        for bucket_x in range(rect.x1 // size, rect.x2 // size + 1):
+            for bucket_y in range(rect.y1 // size, rect.y2 // size + 1):
+                yield bucket_x, bucket_y
+
+    def add(self, room):
+        """Adds a room to the index.
+
+        Args:
+            room(Rect): The room to add.
+
+        Returns:
+            (int): The room's position in the rooms list.
+        """
+
+        room_id = len(self.rooms)
+        self.rooms.append(room)
+
+        for key in self._bucket_keys(room):
+            self.buckets.setdefault(key, []).append(room_id)
+
+        return room_id
+
+    def intersects(self, rect):
+        """Returns True if a rectangle intersects with any room in the index.
+
+        Uses the same rules as Rect.intersect, so rooms that only touch
+        edges still count as intersecting.
+
+        Args:
+            rect(Rect): The rectangle to check.
+
+        Returns:
+            (bool): Does this rectangle intersect with any room?
+        """
+
+        for key in self._bucket_keys(rect):
+            for room_id in self.buckets.get(key, ()):
+                if rect.intersect(self.rooms[room_id]):
+                    return True
+
+        return False
+
+    def room_at(self, x, y):
+        """Returns the index of the room whose interior contains a point.
+
+        Args:
+            x(int): x coordinate.
+            y(int): y coordinate.
+
+        Returns:
+            (int): Position of the room in the rooms list, or None if the
+                point isn't inside any room.
+        """
+
+        size = self.bucket_size
+
+        for room_id in self.buckets.get((x // size, y // size), ()):
+            if self.rooms[room_id].contains(x, y):
+                return room_id
+
+        return None
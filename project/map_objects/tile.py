@@ -1,30 +1,46 @@
-"""
-A tile on a map. It may or may not be blocked, and may or may not block sight.
-"""
-
-
-#  Coded by Philip Hofman, Copyright (c) 2020.
-
-class Tile:
-    """This is the Tile class. It tells you if it's blocked, blocks sight, or explored."""
-
-    def __init__(self, blocked, block_sight=None):
-        """Inits default values for this Tile.
-
-        Sets 'blocked' to its passed value. If 'block_sight' isn't set to a value,
-        it's automatically set to the same value as 'blocked'. Explored is always
-        set to false.
-
-        Args:
-            blocked(bool): Indicates if this tile blocks movement.
-            block_sight(bool): Indicates if this tile blocks sight.
-        """
-
-        self.blocked = blocked
-
-        if block_sight is None:
-            block_sight = blocked
-
-        self.block_sight = block_sight
-
-        self.explored = False
+"""
+Tiles on a map. Each tile may or may not be blocked, and may or may not block sight.
+
+Rather than one Python object per tile, the whole map is stored as a single NumPy structured array
+with one field per flag, so whole-map views (e.g. tiles['blocked']) can be read without any Python loops.
+"""
+
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import numpy as np
+
+# One record per tile. The field names match the attributes of the old Tile class.
+tile_dt = np.dtype([
+    ('blocked', np.bool_),
+    ('block_sight', np.bool_),
+])
+
+
+def new_tiles(width, height, blocked=True, block_sight=None):
+    """Creates a 2D structured array of tiles, indexed as tiles[x, y].
+
+    The array is returned as a NumPy recarray, so single tiles can still
+    be used the old way: game_map.tiles[x][y].blocked reads (and writes)
+    straight through to the underlying array. New code should prefer the
+    whole-map field views, e.g. tiles['blocked'].
+
+    Args:
+        width(int): Width of the map in tiles.
+        height(int): Height of the map in tiles.
+        blocked(bool): Indicates if the tiles block movement.
+        block_sight(bool): Indicates if the tiles block sight. If it isn't
+            set to a value, it's automatically set to the same value as 'blocked'.
+
+    Returns:
+        tiles(np.recarray): A (width, height) array of tile_dt records.
+    """
+
+    if block_sight is None:
+        block_sight = blocked
+
+    tiles = np.zeros((width, height), dtype=tile_dt).view(np.recarray)
+    tiles['blocked'] = blocked
+    tiles['block_sight'] = block_sight
+
+    return tiles
@@ -1,55 +1,205 @@
-#  Coded by Philip Hofman, Copyright (c) 2020.
-
-from random import randint
-
-
-def from_dungeon_level(table, dungeon_level):
-    """Returns int from table based on dungeon level."""
-
-    for (value, level) in reversed(table):
-        if dungeon_level >= level:
-            return value
-
-    return 0
-
-
-def random_choice_index(chances):
-    """Returns a random index of an iterable.
-
-    Args:
-        chances: The iterable to randomly choose from.
-
-    Returns:
-        Index of random position in iterable.
-    """
-
-    # Choose a random number within the weight sum of all choices.
-    random_chance = randint(1, sum(chances))
-
-    running_sum = 0
-    choice = 0
-    for w in chances:
-        # Add item weight to total.
-        running_sum += w
-
-        # If our random chance becomes less than the running sum
-        # of item weights, return current choice index.
-        if random_chance <= running_sum:
-            return choice
-        choice += 1
-
-
-def random_choice_from_dict(choice_dict):
-    """Return random key from dictionary.
-
-    Args:
-        choice_dict(dict): Dictionary to choose from.
-
-    Returns:
-        Randomly chosen dictionary key.
-    """
-
-    choices = list(choice_dict.keys())
-    chances = list(choice_dict.values())
-
-    return choices[random_choice_index(chances)]
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import random
+
+import numpy as np
+
+
+def from_dungeon_level(table, dungeon_level):
+    """Returns int from table based on dungeon level."""
+
+    for (value, level) in reversed(table):
+        if dungeon_level >= level:
+            return value
+
+    return 0
+
+
+def random_choice_index(chances, rng=None):
+    """Returns a random index of an iterable.
+
+    Args:
+        chances: The iterable to randomly choose from.
+        rng(RandomStream): Random number generator to draw from.
+            Defaults to the global one in the random module.
+
+    Returns:
+        Index of random position in iterable.
+    """
+
+    # Choose a random number within the weight sum of all choices.
+    random_chance = (rng or random).randint(1, sum(chances))
+
+    running_sum = 0
+    choice = 0
+    for w in chances:
+        # Add item weight to total.
+        running_sum += w
+
+        # If our random chance becomes less than the running sum
+        # of item weights, return current choice index.
+        if random_chance <= running_sum:
+            return choice
+        choice += 1
+
+
+def random_choice_from_dict(choice_dict, rng=None):
+    """Return random key from dictionary.
+
+    Args:
+        choice_dict(dict): Dictionary to choose from.
+        rng(RandomStream): Random number generator to draw from.
+            Defaults to the global one in the random module.
+
+    Returns:
+        Randomly chosen dictionary key.
+    """
+
+    choices = list(choice_dict.keys())
+    chances = list(choice_dict.values())
+
+    return choices[random_choice_index(chances, rng)]
+
+
+def random_choice_indices(chances, size, rng):
+    """Returns several random indices of an iterable at once.
+
+    Works like random_choice_index, but draws all the numbers in one
+    batched NumPy call and looks them up with a binary search.
+
+    Args:
+        chances: The iterable of weights to randomly choose from.
+        size(int): How many indices to draw.
+        rng(RandomStream): The stream to draw from.
+
+    Returns:
+        (np.ndarray): Array of chosen indices.
+    """
+
+    if size == 0:
+        return np.zeros(0, dtype=int)
+
+    running_sums = np.cumsum(list(chances))
+
+    return np.searchsorted(running_sums, rng.randint_array(1, running_sums[-1], size))
+
+
+# Every stream gets its own number, which is mixed into its seed.
+STREAMS = {
+    'map': 0,
+    'spawn': 1,
+    'combat': 2,
+    'ai': 3
+}
+
+
+class RandomStream:
+    """One independent stream of random numbers.
+
+    Wraps a random.Random for single draws and a NumPy Generator for
+    batched draws, both seeded from the same SeedSequence.
+
+    Attributes:
+        seed_sequence(np.random.SeedSequence): Where this stream's seed comes from.
+        random(random.Random): Used for single draws.
+        generator(np.random.Generator): Used for batched draws.
+    """
+
+    def __init__(self, seed_sequence):
+        """Inits both generators from a SeedSequence.
+
+        Args:
+            seed_sequence(np.random.SeedSequence): Where this stream's seed comes from.
+        """
+
+        self.seed_sequence = seed_sequence
+        self.random = random.Random(int(seed_sequence.generate_state(1, np.uint64)[0]))
+        self.generator = np.random.default_rng(seed_sequence)
+
+    def randint(self, a, b):
+        """Returns a random int N such that a <= N <= b, like random.randint."""
+
+        return self.random.randint(a, b)
+
+    def choice(self, seq):
+        """Returns a random element of a non-empty sequence, like random.choice."""
+
+        return self.random.choice(seq)
+
+    def randint_array(self, a, b, size):
+        """Returns an array of random ints N such that a <= N <= b.
+
+        Like NumPy, a and b can also be sequences that broadcast against
+        size, e.g. to draw (x, y) pairs with different bounds per axis.
+
+        Args:
+            a(int): Lowest possible value.
+            b(int): Highest possible value.
+            size(int): How many numbers to draw, or the shape of the array.
+
+        Returns:
+            (np.ndarray): Array of random ints.
+        """
+
+        return self.generator.integers(a, b, size=size, endpoint=True)
+
+
+class GameRNG:
+    """Hands out independent random streams, all seeded from one master seed.
+
+    There's one stream per name in STREAMS for the game as a whole, and
+    one per name per dungeon level. A floor's streams only depend on the
+    master seed and the dungeon level, so floor N can be generated on its
+    own (or in parallel with other floors) without replaying floors 1..N-1.
+
+    Attributes:
+        seed(int): The master seed.
+        streams(dict): Game-wide streams that have been handed out so far.
+    """
+
+    def __init__(self, seed=None):
+        """Inits the master seed.
+
+        Args:
+            seed(int): The master seed. If it isn't set, a random one is picked.
+        """
+
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+
+        self.seed = seed
+        self.streams = {}
+
+    def stream(self, name):
+        """Returns the game-wide stream with the given name.
+
+        The same stream object is returned every time, so draws carry on
+        where they left off (e.g. the 'ai' or 'combat' streams).
+
+        Args:
+            name(str): One of the names in STREAMS.
+
+        Returns:
+            (RandomStream): The stream.
+        """
+
+        if name not in self.streams:
+            self.streams[name] = RandomStream(np.random.SeedSequence(self.seed, spawn_key=(STREAMS[name], 0)))
+
+        return self.streams[name]
+
+    def floor_stream(self, name, dungeon_level):
+        """Returns a fresh stream for one dungeon level.
+
+        A new stream is made on every call, so generating the same floor
+        twice gives the same result.
+
+        Args:
+            name(str): One of the names in STREAMS, e.g. 'map' or 'spawn'.
+            dungeon_level(int): The floor the stream belongs to (1 and up).
+
+        Returns:
+            (RandomStream): The stream.
+        """
+
+        return RandomStream(np.random.SeedSequence(self.seed, spawn_key=(STREAMS[name], dungeon_level)))
@@ -0,0 +1,222 @@
+"""
+Plays lots of seeded games with a bot in parallel worker processes and reports how they went, for balance tuning.
+
+Every game is a headless GameSession played by the chosen bot until the player dies or runs out of turns. Games are
+independent and only a small summary of each is sent back, so throughput scales with the number of worker processes.
+Run it from the repository root:
+
+    python -m project.tools.balance_sim --games 1000 --bot descent --bot-arg heal_below=0.5 --max-turns 3000
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from project.game_states import GameStates
+from project.loader_functions.initialize_new_game import get_constants
+from project.tools.soak_test import BOTS, new_session
+from project.tools.batch_generate import parse_range
+
+
+def parse_bot_arg(text):
+    """Turns a 'NAME=VALUE' string into a (name, value) pair, with the value as a number if it is one."""
+
+    name, value = text.split('=', 1)
+
+    for number_type in (int, float):
+        try:
+            return name, number_type(value)
+        except ValueError:
+            pass
+
+    return name, value
+
+
+def play_one(seed, bot_name, bot_kwargs, max_turns, energy_turns):
+    """Plays one game to the end and summarizes it. Runs in a worker process.
+
+    Args:
+        seed(int): The game's master seed. The bot gets the same seed.
+        bot_name(str): Key of the bot in BOTS.
+        bot_kwargs(dict): Extra arguments for the bot.
+        max_turns(int): Stop after this many turns if the player is still alive.
+        energy_turns(bool): Use the speed-based TurnScheduler.
+
+    Returns:
+        (dict): How the game went: whether and how deep the player died, turns survived, the turn each
+            experience level was reached on, items used and the time spent in each phase.
+    """
+
+    constants = get_constants()
+    constants['seed'] = seed
+    constants['energy_turns'] = energy_turns
+
+    bot = BOTS[bot_name](seed, **bot_kwargs)
+    session = new_session(constants)
+
+    items_used = Counter()
+    level_turns = {}
+    bot_seconds = 0.0
+    # Menus and targeting don't end the turn, so cap the actions as well as the turns
+    actions = 0
+
+    while session.turn < max_turns and actions < max_turns * 10:
+        start = time.perf_counter()
+        action, mouse_action = bot.act(session)
+        bot_seconds += time.perf_counter() - start
+
+        # Work out which item this action uses, if it turns out to be consumed or equipped
+        item = None
+        if session.game_state == GameStates.SHOW_INVENTORY and action.get('inventory_index') is not None:
+            index = action['inventory_index']
+            if index < len(session.player.inventory.items):
+                item = session.player.inventory.items[index]
+        elif session.game_state == GameStates.TARGETING and mouse_action.get('left_click'):
+            item = session.targeting_item
+
+        level = session.player.level.current_level
+
+        events = session.step(action, mouse_action)
+        actions += 1
+
+        if item and any(event.get('consumed') or event.get('equip') for event in events):
+            items_used[item.name] += 1
+
+        if session.player.level.current_level > level:
+            level_turns[session.player.level.current_level] = session.turn
+
+        if session.game_state == GameStates.PLAYER_DEAD:
+            break
+
+    session.close()
+
+    phase_seconds = dict(session.phase_seconds, bot=bot_seconds)
+
+    return {
+        'seed': seed,
+        'died': session.game_state == GameStates.PLAYER_DEAD,
+        'depth': session.game_map.dungeon_level,
+        'turns': session.turn,
+        'level_turns': level_turns,
+        'items_used': dict(items_used),
+        'phase_seconds': phase_seconds,
+    }
+
+
+def play_batch(seeds, bot_name, bot_kwargs, max_turns, energy_turns):
+    """Plays several games in one worker task, so short games don't drown in task overhead."""
+
+    return [play_one(seed, bot_name, bot_kwargs, max_turns, energy_turns) for seed in seeds]
+
+
+def percentiles(values):
+    """Returns the 10th, 50th and 90th percentiles of some values as a formatted string."""
+
+    if not values:
+        return '- / - / -'
+
+    return '{0:.0f} / {1:.0f} / {2:.0f}'.format(*np.percentile(values, [10, 50, 90]))
+
+
+def report(games, elapsed, workers):
+    """Prints the summary of a batch of games.
+
+    Args:
+        games(list): play_one results.
+        elapsed(float): Wall clock seconds the whole batch took.
+        workers(int): Worker processes used.
+    """
+
+    deaths = [game for game in games if game['died']]
+    turns = [game['turns'] for game in games]
+
+    print('{0} games in {1:.2f}s with {2} workers ({3:.1f} games/s, {4:.0f} turns/s).'.format(
+        len(games), elapsed, workers, len(games) / elapsed, sum(turns) / elapsed))
+
+    print()
+    print('Died: {0} of {1} ({2:.0%}).'.format(len(deaths), len(games), len(deaths) / len(games)))
+    print('Turns survived, p10 / median / p90: {0}'.format(percentiles(turns)))
+
+    print()
+    print('Death depth:')
+    depth_counts = Counter(game['depth'] for game in deaths)
+    for depth in sorted(depth_counts):
+        print('  floor {0:>3}: {1:>6} ({2:.0%})'.format(depth, depth_counts[depth], depth_counts[depth] / len(deaths)))
+
+    print()
+    print('XP curve (turn each level was reached on):')
+    levels = sorted({level for game in games for level in game['level_turns']})
+    for level in levels:
+        reached = [game['level_turns'][level] for game in games if level in game['level_turns']]
+        print('  level {0:>3}: {1:>6} games, p10 / median / p90 turn {2}'.format(level, len(reached),
+                                                                                percentiles(reached)))
+
+    print()
+    print('Items used (per game):')
+    items_used = Counter()
+    for game in games:
+        items_used.update(game['items_used'])
+    for name, count in items_used.most_common():
+        print('  {0:<20} {1:>8} ({2:.2f})'.format(name, count, count / len(games)))
+
+    print()
+    print('Time per phase (summed over workers):')
+    phase_seconds = Counter()
+    for game in games:
+        phase_seconds.update(game['phase_seconds'])
+    total = sum(phase_seconds.values())
+    for phase, seconds in phase_seconds.most_common():
+        print('  {0:<8} {1:>8.2f}s ({2:.0%}, {3:.1f}us/turn)'.format(phase, seconds, seconds / total,
+                                                                  seconds / max(sum(turns), 1) * 1e6))
+    print('  Worker utilisation: {0:.0%}'.format(total / (elapsed * workers)))
+
+
+def main(argv=None):
+    """Plays the requested games across a process pool and prints a report."""
+
+    parser = argparse.ArgumentParser(description='Simulate seeded games with a bot for balance tuning.')
+    parser.add_argument('--games', type=int, default=200, help='Games to play. Seeds count up from --first-seed.')
+    parser.add_argument('--seeds', type=parse_range, default=None, help='Seed range as START:STOP, instead of --games.')
+    parser.add_argument('--first-seed', type=int, default=0, help='Seed of the first game.')
+    parser.add_argument('--bot', choices=sorted(BOTS), default='descent', help='Who plays.')
+    parser.add_argument('--bot-arg', type=parse_bot_arg, action='append', default=[],
+                        help='Extra bot argument as NAME=VALUE, e.g. heal_below=0.5. Can be repeated.')
+    parser.add_argument('--max-turns', type=int, default=5000, help='Turns before a surviving game is stopped.')
+    parser.add_argument('--energy-turns', action='store_true', help='Use the speed-based TurnScheduler.')
+    parser.add_argument('--batch-size', type=int, default=4, help='Games per worker task.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes.')
+    args = parser.parse_args(argv)
+
+    seeds = list(args.seeds if args.seeds is not None else range(args.first_seed, args.first_seed + args.games))
+    if not seeds:
+        parser.error('no games to play; --games must be at least 1 and --seeds START:STOP needs STOP > START')
+
+    batches = [seeds[i:i + args.batch_size] for i in range(0, len(seeds), args.batch_size)]
+    bot_kwargs = dict(args.bot_arg)
+
+    games = []
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(play_batch, batch, args.bot, bot_kwargs, args.max_turns, args.energy_turns)
+                   for batch in batches]
+
+        for future in futures:
+            games.extend(future.result())
+
+            print('{0}/{1} games'.format(len(games), len(seeds)), end='\r', flush=True)
+
+    elapsed = time.perf_counter() - start
+
+    print()
+    report(games, elapsed, args.workers)
+
+
+if __name__ == '__main__':
+    main()
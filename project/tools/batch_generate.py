@@ -0,0 +1,155 @@
+"""
+Generates lots of floors in parallel for balance analysis, without starting the game.
+
+Every (seed, size, dungeon level) combination is generated with generate_floor in a pool of worker processes.
+Each worker writes its floors straight to a shard: a compressed .npz with the tile arrays and a .jsonl file with
+one line per floor (player start, rooms and spawned entities). Run it from the repository root:
+
+    python -m project.tools.batch_generate --seeds 0:1000 --sizes 80x43 --levels 1 5 10 --out floors
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from project.benchmarks.make_map_benchmark import parse_size
+from project.loader_functions.initialize_new_game import get_constants
+from project.map_objects.game_map import generate_floor
+
+
+def parse_range(text):
+    """Turns a 'START:STOP' string into a range, or a single number into a one-item range."""
+
+    if ':' in text:
+        start, stop = text.split(':')
+        return range(int(start), int(stop))
+
+    return range(int(text), int(text) + 1)
+
+
+def floor_record(key, seed, floor_map, floor_entities):
+    """Describes one generated floor as a JSON-friendly dictionary.
+
+    Args:
+        key(str): Name of the floor's tile array in the shard's .npz file.
+        seed(int): The master seed the floor was generated from.
+        floor_map(GameMap): The generated map.
+        floor_entities(list): The generated entities, with the stand-in player first.
+
+    Returns:
+        (dict): The floor's description.
+    """
+
+    start = floor_entities[0]
+
+    return {
+        'key': key,
+        'seed': seed,
+        'dungeon_level': floor_map.dungeon_level,
+        'width': floor_map.width,
+        'height': floor_map.height,
+        'player_start': [start.x, start.y],
+        'rooms': [[room.x1, room.y1, room.x2, room.y2] for room in floor_map.rooms],
+        'spawns': [{'name': entity.name, 'x': entity.x, 'y': entity.y} for entity in floor_entities[1:]]
+    }
+
+
+def generate_shard(shard_index, jobs, max_rooms, scale_rooms, out_dir):
+    """Generates one shard's worth of floors and writes them to disk. Runs in a worker process.
+
+    Args:
+        shard_index(int): Used to name the shard's files.
+        jobs(list): (seed, width, height, dungeon_level) tuples to generate.
+        max_rooms(int): Max rooms per floor, or None for the game's default.
+        scale_rooms(bool): Scale max rooms with map area, keeping the default room density.
+        out_dir(str): Directory to write the shard to.
+
+    Returns:
+        (tuple): Number of floors generated and seconds spent generating them.
+    """
+
+    constants = get_constants()
+    base_area = constants['map_width'] * constants['map_height']
+
+    if max_rooms is None:
+        max_rooms = constants['max_rooms']
+
+    start = time.perf_counter()
+    arrays = {}
+
+    name = 'shard_{0:05d}'.format(shard_index)
+
+    with open(os.path.join(out_dir, name + '.jsonl'), 'w') as records_file:
+        for i, (seed, width, height, dungeon_level) in enumerate(jobs):
+            floor_constants = dict(constants, map_width=width, map_height=height, max_rooms=max_rooms)
+            if scale_rooms:
+                floor_constants['max_rooms'] = max(max_rooms, max_rooms * width * height // base_area)
+
+            floor_map, floor_entities = generate_floor(seed, dungeon_level, floor_constants)
+
+            key = 'floor_{0}'.format(i)
+            arrays[key] = np.asarray(floor_map.tiles)
+
+            records_file.write(json.dumps(floor_record(key, seed, floor_map, floor_entities)) + '\n')
+
+    np.savez_compressed(os.path.join(out_dir, name + '.npz'), **arrays)
+
+    return len(jobs), time.perf_counter() - start
+
+
+def main(argv=None):
+    """Splits the requested floors into shards, generates them across a process pool and prints a report."""
+
+    parser = argparse.ArgumentParser(description='Generate dungeon floors in parallel.')
+    parser.add_argument('--seeds', type=parse_range, default=range(0, 100), help='Seed range as START:STOP.')
+    parser.add_argument('--sizes', nargs='+', default=['80x43'], help='Map sizes as WIDTHxHEIGHT.')
+    parser.add_argument('--levels', nargs='+', type=int, default=[1], help='Dungeon levels to generate.')
+    parser.add_argument('--max-rooms', type=int, default=None, help='Max rooms per floor.')
+    parser.add_argument('--scale-rooms', action='store_true',
+                        help='Scale max rooms with map area, keeping the default 80x43 room density.')
+    parser.add_argument('--shard-size', type=int, default=500, help='Floors per shard.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes.')
+    parser.add_argument('--out', default='generated_floors', help='Directory to write shards to.')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+
+    sizes = [parse_size(size) for size in args.sizes]
+    jobs = [(seed, width, height, dungeon_level)
+            for seed, (width, height), dungeon_level in itertools.product(args.seeds, sizes, args.levels)]
+    shards = [jobs[i:i + args.shard_size] for i in range(0, len(jobs), args.shard_size)]
+
+    floors = 0
+    worker_seconds = 0.0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(generate_shard, shard_index, shard, args.max_rooms, args.scale_rooms, args.out)
+                   for shard_index, shard in enumerate(shards)]
+
+        for future in as_completed(futures):
+            shard_floors, shard_seconds = future.result()
+            floors += shard_floors
+            worker_seconds += shard_seconds
+
+            print('{0}/{1} floors'.format(floors, len(jobs)), end='\r', flush=True)
+
+    elapsed = time.perf_counter() - start
+
+    print()
+    print('Generated {0} floors in {1} shards to {2} in {3:.2f}s.'.format(floors, len(shards), args.out, elapsed))
+    print('Throughput: {0:.1f} floors/s overall, {1:.1f} floors/s per core ({2} workers).'.format(
+        floors / elapsed, floors / elapsed / args.workers, args.workers))
+    if worker_seconds:
+        print('Worker-side rate: {0:.1f} floors/s per core.'.format(floors / worker_seconds))
+
+
+if __name__ == '__main__':
+    main()
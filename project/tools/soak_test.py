@@ -0,0 +1,84 @@
+"""
+Plays games headlessly with a bot for as many turns as asked, and reports how fast it went.
+
+New games are started whenever the player dies. Run it from the repository root:
+
+    python -m project.tools.soak_test --turns 20000 --bot descent --seed 1
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import argparse
+import time
+
+from project.bots import DescentBot, RandomBot
+from project.game_session import GameSession
+from project.game_states import GameStates
+from project.loader_functions.initialize_new_game import get_constants, get_game_variables
+
+BOTS = {'random': RandomBot, 'descent': DescentBot}
+
+
+def new_session(constants):
+    """Starts a new headless game.
+
+    Args:
+        constants(dict): Dictionary of constant game variables.
+
+    Returns:
+        (GameSession): The new game.
+    """
+
+    player, entities, game_map, message_log, game_state = get_game_variables(constants)
+
+    return GameSession(player, entities, game_map, message_log, game_state, constants)
+
+
+def main(argv=None):
+    """Drives games with a bot and prints turns per second, games played and the deepest floor reached."""
+
+    parser = argparse.ArgumentParser(description='Play the game headlessly with a bot.')
+    parser.add_argument('--turns', type=int, default=10000, help='Actions to play in total.')
+    parser.add_argument('--bot', choices=sorted(BOTS), default='random', help='Who plays.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the first game. Later games count up from it.')
+    parser.add_argument('--energy-turns', action='store_true', help='Use the speed-based TurnScheduler.')
+    args = parser.parse_args(argv)
+
+    constants = get_constants()
+    constants['energy_turns'] = args.energy_turns
+    constants['seed'] = args.seed
+
+    bot = BOTS[args.bot](args.seed)
+    session = new_session(constants)
+
+    games = 1
+    deepest = 1
+    turns = 0
+    start = time.perf_counter()
+
+    for _ in range(args.turns):
+        action, mouse_action = bot.act(session)
+        session.step(action, mouse_action)
+
+        deepest = max(deepest, session.game_map.dungeon_level)
+
+        if session.game_state == GameStates.PLAYER_DEAD:
+            session.close()
+
+            turns += session.turn
+            constants['seed'] = args.seed + games
+            session = new_session(constants)
+            games += 1
+
+    turns += session.turn
+    session.close()
+
+    elapsed = time.perf_counter() - start
+
+    print('{0} actions, {1} turns in {2:.2f}s ({3:.0f} actions/s, {4:.0f} turns/s).'.format(
+        args.turns, turns, elapsed, args.turns / elapsed, turns / elapsed))
+    print('{0} games, deepest floor {1}.'.format(games, deepest))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+A time-based turn scheduler, the alternative to strictly alternating player and enemy turns.
+
+Every actor has a time its next action is due, kept in a heap. An action pushes the actor's next action back by an
+amount that shrinks as its speed goes up, so a fast monster acts twice for every move of a normal-speed player and a
+slow one every other move, without any extra passes over the monsters. Getting the next actor is O(log n).
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import heapq
+
+
+class TurnScheduler:
+    """Decides who acts next, by when their next action is due.
+
+    Only the player and awake monsters are scheduled; dormant monsters
+    cost nothing. Actors due at the same time go in their ActorSet order
+    after the player, so when everyone has the same speed the turns come
+    out exactly like the alternating player and enemy turns.
+
+    Attributes:
+        player(Entity): The player, who is always scheduled.
+        queue(list): A heap of (time, order, entity) entries.
+        scheduled(dict): Entity -> the time its queued entry is due.
+        time(int): When the action being taken right now was due.
+    """
+
+    TURN_LENGTH = 100
+    NORMAL_SPEED = 100
+
+    # Sorts the player before every monster due at the same time
+    PLAYER_ORDER = -1
+
+    def __init__(self, player, time=0):
+        """Inits the scheduler with the player due to act.
+
+        Args:
+            player(Entity): The player's Entity object.
+            time(int): The time the player's action is due.
+        """
+
+        self.player = player
+        self.queue = []
+        self.scheduled = {}
+        self.time = time
+
+        self.schedule(player, self.PLAYER_ORDER, time)
+
+    def __len__(self):
+        return len(self.scheduled)
+
+    def delay(self, entity):
+        """Returns how long an action takes an entity, from its speed.
+
+        Args:
+            entity(Entity): The entity taking the action.
+
+        Returns:
+            (int): The time until its next action is due.
+        """
+
+        speed = entity.fighter.speed if entity.fighter else self.NORMAL_SPEED
+
+        return max(1, round(self.TURN_LENGTH * self.NORMAL_SPEED / speed))
+
+    def schedule(self, entity, order, time):
+        """Queues an entity's next action.
+
+        Args:
+            entity(Entity): The entity to queue.
+            order(int): Breaks ties between entities due at the same time.
+            time(int): When the action is due.
+        """
+
+        self.scheduled[entity] = time
+        heapq.heappush(self.queue, (time, order, entity))
+
+    def clear(self):
+        """Forgets every monster, e.g. after changing floors. The player stays due when they were."""
+
+        time = self.scheduled[self.player]
+        self.queue = []
+        self.scheduled = {}
+
+        self.schedule(self.player, self.PLAYER_ORDER, time)
+
+    def sync(self, actors):
+        """Schedules every awake actor that isn't scheduled yet, to act right after the player.
+
+        Args:
+            actors(ActorSet): The floor's actors.
+        """
+
+        time = self.scheduled[self.player]
+
+        for entity in actors.awake:
+            if entity not in self.scheduled:
+                self.schedule(entity, actors.order[entity], time)
+
+    def enemy_turns(self, actors):
+        """Takes the player's action and yields every monster due to act before the player is again.
+
+        Each monster is rescheduled after the caller is done with it,
+        unless it was put to sleep or removed from the ActorSet meanwhile.
+        Entries for monsters that left the awake set are dropped as they
+        come up.
+
+        Args:
+            actors(ActorSet): The floor's actors.
+
+        Yields:
+            (Entity): The next monster to act.
+        """
+
+        self.sync(actors)
+
+        time, order, player = heapq.heappop(self.queue)
+        self.time = time
+        self.schedule(player, order, time + self.delay(player))
+
+        while self.queue[0][2] is not self.player:
+            time, order, entity = heapq.heappop(self.queue)
+            del self.scheduled[entity]
+
+            if entity not in actors.awake:
+                continue
+
+            self.time = time
+
+            yield entity
+
+            if entity in actors.awake:
+                self.schedule(entity, order, time + self.delay(entity))
@@ -0,0 +1,32 @@
+"""
+Shared test helpers.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import io
+import pickle
+
+import pytest
+
+
+class AvoidingPickler(pickle.Pickler):
+    """A Pickler that fails if it comes across a given object."""
+
+    def __init__(self, file, forbidden):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.forbidden = forbidden
+
+    def persistent_id(self, obj):
+        assert obj is not self.forbidden, 'the pickle reaches {0!r}'.format(self.forbidden)
+        return None
+
+
+@pytest.fixture
+def assert_pickle_avoids():
+    """Returns a function that pickles something and fails if the pickle takes a given object along."""
+
+    def check(obj, forbidden):
+        AvoidingPickler(io.BytesIO(), forbidden).dump(obj)
+
+    return check
@@ -0,0 +1,36 @@
+"""
+Monster AIs keep the shared NavigationGrid up to date as they move.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import numpy as np
+
+from project.components.ai import ConfusedMonster
+from project.loader_functions.initialize_new_game import get_constants
+from project.map_objects.game_map import generate_floor
+
+
+def test_confused_monster_updates_occupancy():
+    game_map, floor_entities = generate_floor(1, 3, get_constants())
+    navigation = game_map.navigation
+    monster = next(entity for entity in floor_entities if entity.ai)
+
+    confused_ai = ConfusedMonster(monster.ai, 10)
+    confused_ai.owner = monster
+    monster.ai = confused_ai
+
+    navigation.update()
+    moves = 0
+
+    for _ in range(10):
+        old_position = (monster.x, monster.y)
+        monster.ai.take_turn(None, None, game_map, floor_entities)
+        moves += (monster.x, monster.y) != old_position
+
+        # The cost grid the other monsters plan on must already match what a full rebuild gives.
+        cost = navigation.cost.copy()
+        navigation.update()
+        assert np.array_equal(cost, navigation.cost)
+
+    assert moves
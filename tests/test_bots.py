@@ -0,0 +1,34 @@
+"""
+Bots only ask for moves the player could make with the keyboard.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+from project.bots import DescentBot
+from project.game_states import GameStates
+from project.loader_functions.initialize_new_game import get_constants
+from project.tools.soak_test import new_session
+
+
+def test_descent_bot_moves_one_step():
+    for seed in range(5):
+        constants = get_constants()
+        constants['seed'] = seed
+
+        session = new_session(constants)
+        bot = DescentBot(seed)
+
+        for _ in range(400):
+            session.update_fov()
+            action, mouse_action = bot.act(session)
+
+            if action.get('move'):
+                dx, dy = action['move']
+                assert max(abs(dx), abs(dy)) == 1, 'seed {0}: move {1}'.format(seed, (dx, dy))
+
+            session.step(action, mouse_action)
+
+            if session.game_state == GameStates.PLAYER_DEAD:
+                break
+
+        session.close()
@@ -0,0 +1,30 @@
+"""
+Round trip of save_game and load_game.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+from project.game_states import GameStates
+from project.loader_functions.data_loaders import load_game, save_game
+from project.loader_functions.initialize_new_game import get_constants, get_game_variables
+
+
+def test_entity_index_holds_loaded_entities(tmp_path, monkeypatch):
+    """The loaded map's entity index must hold the loaded entities themselves, not copies of them."""
+
+    monkeypatch.chdir(tmp_path)
+
+    player, entities, game_map, message_log, game_state = get_game_variables(get_constants())
+    save_game(player, entities, game_map, message_log, game_state)
+
+    player, entities, game_map, message_log, game_state = load_game()
+    index = game_map.entity_index
+
+    indexed = [entity for x, y in list(index.cells) for entity in index.entities_at(x, y)]
+    loaded_ids = {id(entity) for entity in entities}
+
+    assert len(indexed) == len(entities)
+    assert all(id(entity) in loaded_ids for entity in indexed)
+    assert any(entity is player for entity in index.entities_at(player.x, player.y))
+    assert all(entity.spatial_index is index for entity in entities)
+    assert game_state == GameStates.PLAYERS_TURN
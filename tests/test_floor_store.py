@@ -0,0 +1,75 @@
+"""
+Floors going into a FloorStore and coming back out the same, from memory, compressed or from disk.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import numpy as np
+import pytest
+
+from project.loader_functions.initialize_new_game import get_constants, get_game_variables
+from project.map_objects.floor_store import FloorStore
+
+
+def new_game():
+    """Starts a seeded game and returns its player, entities and map."""
+
+    constants = get_constants()
+    constants['seed'] = 0
+
+    player, entities, game_map, message_log, game_state = get_game_variables(constants)
+
+    return player, entities, game_map
+
+
+def test_snapshot_leaves_live_map_alone(assert_pickle_avoids):
+    player, entities, game_map = new_game()
+    entity_index = game_map.entity_index
+
+    floor_map, floor_entities = game_map.snapshot_floor(player, entities)
+
+    assert game_map.entity_index is entity_index
+    assert player in entity_index.entities_at(player.x, player.y)
+    assert floor_map.entity_index is not entity_index
+    assert floor_map.navigation is not game_map.navigation
+    assert floor_map.actors is not game_map.actors
+
+    assert_pickle_avoids((floor_map, floor_entities), game_map)
+
+
+@pytest.mark.parametrize('hot_floors, memory_budget, where', [
+    (1, 1024 * 1024, 'hot'),
+    (0, 1024 * 1024, 'cold'),
+    (0, 0, 'on_disk'),
+])
+def test_floor_round_trip(tmp_path, hot_floors, memory_budget, where):
+    player, entities, game_map = new_game()
+    game_map.explored[:10, :10] = True
+
+    floor_map, floor_entities = game_map.snapshot_floor(player, entities)
+    expected = [(entity.name, entity.x, entity.y) for entity in floor_entities]
+
+    store = FloorStore(hot_floors, memory_budget, str(tmp_path))
+    store.put(1, floor_map, floor_entities)
+
+    assert 1 in getattr(store, where)
+
+    floor_map, floor_entities = store.take(1)
+
+    assert 1 not in store
+    assert [(entity.name, entity.x, entity.y) for entity in floor_entities] == expected
+    assert np.array_equal(floor_map.tiles, game_map.tiles)
+    assert np.array_equal(floor_map.explored, game_map.explored)
+
+    # The stored index and actors still hold the stored entities themselves.
+    index = floor_map.entity_index
+    assert all(entity in index.entities_at(entity.x, entity.y) for entity in floor_entities)
+    assert all(entity in floor_entities for entity in floor_map.actors.order)
+
+    # And the floor can be played again.
+    entities = game_map.load_floor(floor_map, floor_entities, player)
+    assert entities[0] is player
+    assert player in game_map.entity_index.entities_at(player.x, player.y)
+
+    store.close()
+    assert not list(tmp_path.iterdir())
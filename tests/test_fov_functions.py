@@ -0,0 +1,48 @@
+"""
+FOVs restored from a FovCache match freshly computed ones.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import numpy as np
+
+from project.fov_functions import FovCache, initialize_fov, recompute_fov
+from project.loader_functions.initialize_new_game import get_constants
+from project.map_objects.game_map import generate_floor
+
+
+def test_cached_fov_matches_computed():
+    game_map, floor_entities = generate_floor(3, 1, get_constants())
+    cells = [tuple(cell) for cell in np.argwhere(~game_map.tiles['blocked'])[:40]]
+
+    fov_map = initialize_fov(game_map)
+    expected = {}
+    for x, y in cells:
+        recompute_fov(fov_map, x, y, 10)
+        expected[(x, y)] = fov_map.fov.copy()
+
+    cache = FovCache()
+    cached_map = initialize_fov(game_map)
+
+    # The first pass fills the cache, the second is all hits.
+    for _ in range(2):
+        for x, y in cells:
+            recompute_fov(cached_map, x, y, 10, cache=cache, map_version=game_map.version)
+            assert np.array_equal(cached_map.fov, expected[(x, y)])
+
+    assert cache.misses == len(cells)
+    assert cache.hits == len(cells)
+
+
+def test_new_map_version_clears_cache():
+    game_map, floor_entities = generate_floor(3, 1, get_constants())
+    x, y = np.argwhere(~game_map.tiles['blocked'])[0]
+
+    fov_map = initialize_fov(game_map)
+    cache = FovCache()
+
+    recompute_fov(fov_map, x, y, 10, cache=cache, map_version=0)
+    recompute_fov(fov_map, x, y, 10, cache=cache, map_version=1)
+
+    assert cache.misses == 2
+    assert len(cache.entries) == 1
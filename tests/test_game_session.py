@@ -0,0 +1,89 @@
+"""
+Which player actions end the turn in a headless GameSession.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import tcod as libtcod
+
+from project.components.item import Item
+from project.entity import Entity
+from project.game_states import GameStates
+from project.item_functions import heal
+from project.loader_functions.initialize_new_game import get_constants
+from project.render_functions import RenderOrder
+from project.tools.soak_test import new_session
+
+
+def make_session():
+    """Starts a seeded game."""
+
+    constants = get_constants()
+    constants['seed'] = 0
+
+    return new_session(constants)
+
+
+def make_potion(x, y):
+    """Returns a healing potion lying at (x, y)."""
+
+    return Entity(x, y, '!', libtcod.violet, 'Healing Potion', render_order=RenderOrder.ITEM,
+                  item=Item(use_function=heal, amount=40))
+
+
+def test_pickup_ends_turn():
+    session = make_session()
+    player = session.player
+
+    potion = make_potion(player.x, player.y)
+    session.entities.append(potion)
+    session.game_map.entity_index.add(potion)
+
+    session.step({'pickup': True})
+
+    assert potion in player.inventory.items
+    assert session.turn == 1
+    assert session.game_state == GameStates.PLAYERS_TURN
+
+
+def test_using_item_ends_turn():
+    session = make_session()
+    player = session.player
+
+    player.inventory.add_item(make_potion(player.x, player.y))
+    player.fighter.hp = 10
+
+    session.step({'show_inventory': True})
+    session.step({'inventory_index': len(player.inventory.items) - 1})
+
+    assert player.fighter.hp > 10
+    assert session.turn == 1
+    assert session.game_state == GameStates.PLAYERS_TURN
+
+
+def test_item_not_used_keeps_turn():
+    session = make_session()
+    player = session.player
+
+    player.inventory.add_item(make_potion(player.x, player.y))
+
+    session.step({'show_inventory': True})
+    session.step({'inventory_index': len(player.inventory.items) - 1})
+
+    assert session.turn == 0
+    assert session.game_state == GameStates.SHOW_INVENTORY
+
+
+def test_drop_ends_turn():
+    session = make_session()
+    player = session.player
+
+    potion = make_potion(player.x, player.y)
+    player.inventory.add_item(potion)
+
+    session.step({'drop_inventory': True})
+    session.step({'inventory_index': player.inventory.items.index(potion)})
+
+    assert potion in session.game_map.entity_index.entities_at(player.x, player.y)
+    assert session.turn == 1
+    assert session.game_state == GameStates.PLAYERS_TURN
@@ -0,0 +1,136 @@
+"""
+Monster pathfinding on the shared NavigationGrid.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import copy
+import pickle
+
+import numpy as np
+import tcod as libtcod
+
+from project.components.ai import BasicMonster
+from project.components.fighter import Fighter
+from project.entity import Entity
+from project.loader_functions.initialize_new_game import get_constants
+from project.map_objects.game_map import GameMap, generate_floor
+from project.map_objects.rectangle import Rect
+from project.map_objects.room_graph import RoomGraph
+from project.render_functions import RenderOrder
+
+
+def test_pickled_grid_leaves_its_map_behind(assert_pickle_avoids):
+    game_map, floor_entities = generate_floor(0, 1, get_constants())
+
+    assert_pickle_avoids(game_map.navigation, game_map)
+
+    # A shallow copy of a map shares the grid, which must not take the original along either.
+    assert_pickle_avoids(copy.copy(game_map), game_map)
+
+
+def test_unpickled_map_rebinds_its_grid():
+    game_map, floor_entities = generate_floor(0, 1, get_constants())
+    game_map.navigation.update()
+
+    loaded = pickle.loads(pickle.dumps(game_map))
+
+    assert loaded.navigation.game_map is loaded
+    assert loaded.navigation.cost is None
+
+    loaded.navigation.update()
+    assert np.array_equal(loaded.navigation.cost, game_map.navigation.cost)
+
+    start, goal = loaded.rooms[0].center(), loaded.rooms[-1].center()
+    path = loaded.navigation.get_path(*start, *goal)
+    assert path
+    assert path == game_map.navigation.get_path(*start, *goal)
+
+
+def corridor_map():
+    """Returns a map of two rooms joined by a 1-wide corridor along y = 5, with the player in the right room.
+
+    Returns:
+        game_map(GameMap): The map, with its room graph built.
+        player(Entity): The player, at (33, 4).
+    """
+
+    game_map = GameMap(40, 12)
+    game_map.room_graph = RoomGraph(40, 12)
+
+    for room in (Rect(1, 1, 10, 8), Rect(28, 1, 10, 8)):
+        game_map.create_room(room)
+        game_map.room_graph.add_room(room)
+
+    game_map.carve_corridor(6, 5, 33, 5, horizontal_first=True)
+    game_map.room_graph.add_corridor(6, 5, 33, 5, True)
+
+    player = Entity(33, 4, '@', libtcod.white, 'Player', blocks=True, render_order=RenderOrder.ACTOR)
+    game_map.entity_index.add(player)
+
+    return game_map, player
+
+
+def add_orc(game_map, x, y):
+    """Puts a blocking monster on the map and returns it."""
+
+    orc = Entity(x, y, 'o', libtcod.desaturated_green, 'Orc', blocks=True, render_order=RenderOrder.ACTOR,
+                 fighter=Fighter(hp=10, defense=0, power=3, xp=35), ai=BasicMonster())
+    game_map.entity_index.add(orc)
+
+    return orc
+
+
+def assert_walkable_steps(start, path):
+    """Fails unless every step of a path is one move from the one before it, starting at start."""
+
+    for (x1, y1), (x2, y2) in zip([start] + path, path):
+        assert max(abs(x2 - x1), abs(y2 - y1)) == 1, 'step from {0} to {1}'.format((x1, y1), (x2, y2))
+
+
+def test_plan_goes_through_the_corridor():
+    game_map, player = corridor_map()
+
+    area_id, doors = game_map.room_graph.plan(4, 4, player.x, player.y)
+
+    assert game_map.room_graph.areas[area_id] == (2, 2, 11, 9)
+    assert len(doors) == 2
+    for (exit_x, exit_y), (entry_x, entry_y) in doors:
+        assert max(abs(entry_x - exit_x), abs(entry_y - exit_y)) == 1
+
+
+def test_route_is_walkable():
+    game_map, player = corridor_map()
+    game_map.navigation.update()
+
+    start = (12, 5)
+    route = game_map.navigation.get_route(*start, player.x, player.y)
+
+    assert route
+    assert_walkable_steps(start, route)
+
+
+def test_blocked_corridor_gives_no_route():
+    game_map, player = corridor_map()
+    add_orc(game_map, 20, 5)
+    game_map.navigation.update()
+
+    for start in ((12, 5), (4, 4), (19, 5)):
+        route = game_map.navigation.get_route(*start, player.x, player.y)
+        assert_walkable_steps(start, route)
+
+    assert game_map.navigation.get_route(12, 5, player.x, player.y) == []
+
+
+def test_monster_never_jumps():
+    game_map, player = corridor_map()
+    add_orc(game_map, 20, 5)
+    orc = add_orc(game_map, 12, 5)
+
+    for _ in range(10):
+        game_map.navigation.update()
+        old_x, old_y = orc.x, orc.y
+
+        orc.move_astar(player, [player, orc], game_map)
+
+        assert max(abs(orc.x - old_x), abs(orc.y - old_y)) <= 1
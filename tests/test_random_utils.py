@@ -0,0 +1,44 @@
+"""
+Floors generated from the same seed come out the same.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+from project.loader_functions.initialize_new_game import get_constants
+from project.map_objects.game_map import generate_floor
+from project.random_utils import GameRNG
+
+
+def describe(floor):
+    """Returns everything that makes up a generated floor, in a comparable form."""
+
+    floor_map, floor_entities = floor
+
+    return floor_map.tiles.tobytes(), [(entity.name, entity.x, entity.y) for entity in floor_entities]
+
+
+def test_same_seed_same_floors():
+    constants = get_constants()
+
+    for dungeon_level in (1, 2, 5):
+        assert describe(generate_floor(42, dungeon_level, constants)) == \
+            describe(generate_floor(42, dungeon_level, constants))
+
+
+def test_floors_differ_between_levels_and_seeds():
+    constants = get_constants()
+
+    assert describe(generate_floor(42, 1, constants)) != describe(generate_floor(42, 2, constants))
+    assert describe(generate_floor(42, 1, constants)) != describe(generate_floor(43, 1, constants))
+
+
+def test_floor_streams_start_over():
+    rng = GameRNG(7)
+    stream = rng.floor_stream('map', 3)
+    first = [stream.randint(0, 1000) for _ in range(5)]
+
+    # Draws from other streams don't shift a floor's stream.
+    rng.stream('combat').randint(0, 1000)
+    stream = rng.floor_stream('map', 3)
+
+    assert [stream.randint(0, 1000) for _ in range(5)] == first
@@ -0,0 +1,72 @@
+"""
+The TurnScheduler against strictly alternating turns.
+"""
+
+#  Coded by Philip Hofman, Copyright (c) 2020.
+
+import tcod as libtcod
+
+from project.bots import DescentBot
+from project.components.fighter import Fighter
+from project.entity import Entity
+from project.game_states import GameStates
+from project.loader_functions.initialize_new_game import get_constants
+from project.map_objects.actor_set import ActorSet
+from project.tools.soak_test import new_session
+from project.turn_scheduler import TurnScheduler
+
+
+def play(seed, energy_turns, actions=300):
+    """Plays a seeded game with the descent bot and records the game after every action."""
+
+    constants = get_constants()
+    constants['seed'] = seed
+    constants['energy_turns'] = energy_turns
+
+    session = new_session(constants)
+    bot = DescentBot(seed)
+    history = []
+
+    for _ in range(actions):
+        session.update_fov()
+        session.step(*bot.act(session))
+
+        history.append((session.turn, session.game_map.dungeon_level,
+                        sorted((entity.name, entity.x, entity.y, entity.fighter.hp if entity.fighter else None)
+                               for entity in session.entities)))
+
+        if session.game_state == GameStates.PLAYER_DEAD:
+            break
+
+    session.close()
+
+    return history
+
+
+def test_equal_speeds_match_alternating_turns():
+    for seed in range(3):
+        assert play(seed, energy_turns=True) == play(seed, energy_turns=False)
+
+
+def make_actor(name, speed):
+    """Returns an entity with a fighter of the given speed."""
+
+    return Entity(0, 0, 'o', libtcod.white, name, blocks=True, fighter=Fighter(hp=10, defense=0, power=1, speed=speed))
+
+
+def test_speed_sets_turns_per_player_turn():
+    player = make_actor('Player', 100)
+    fast = make_actor('Fast', 200)
+    slow = make_actor('Slow', 50)
+
+    actors = ActorSet()
+    actors.add(fast, awake=True)
+    actors.add(slow, awake=True)
+
+    scheduler = TurnScheduler(player)
+    turns = [[entity.name for entity in scheduler.enemy_turns(actors)] for _ in range(4)]
+
+    # Over four player turns the fast monster acts twice a turn and the slow one every other turn.
+    assert [name for turn in turns for name in turn].count('Fast') == 8
+    assert [name for turn in turns for name in turn].count('Slow') == 2
+    assert turns[0] == ['Fast', 'Slow', 'Fast']